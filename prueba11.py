@@ -0,0 +1,319 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.signal import argrelextrema
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+# Uso:
+#   python prueba11.py                      -> corrida completa, reanudable
+#   python prueba11.py --shard 2/4          -> procesa solo la porción 2 de 4
+#   python prueba11.py --merge              -> une los journals y genera rsi.csv / desvio.csv
+#   python prueba11.py --reiniciar          -> descarta los journals de la corrida y empieza de cero
+#   python prueba11.py --corrida ID         -> identificador de la corrida (por defecto la fecha de hoy)
+#
+# Cada símbolo terminado se registra en un journal (una línea JSON por símbolo)
+# dentro de 'corridas/<ID>/'. Si la corrida se corta, al volver a ejecutarla
+# con el mismo ID solo se procesan los símbolos que faltan; una corrida de
+# otro día usa otra carpeta y vuelve a descargar todo.
+
+CARPETA_CORRIDAS = "corridas"
+
+# === FUNCION PARA CALCULAR RSI MANUALMENTE ===
+def calcular_rsi(series, periodo=14):
+    delta = series.diff()
+    ganancia = delta.where(delta > 0, 0)
+    perdida = -delta.where(delta < 0, 0)
+
+    media_gan = ganancia.rolling(window=periodo).mean()
+    media_per = perdida.rolling(window=periodo).mean()
+
+    rs = media_gan / media_per
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+# === FUNCIONES DEL JOURNAL ===
+def parsear_shard(texto):
+    """
+    Convierte '2/4' en (2, 4). Los shards se numeran desde 1.
+    """
+    try:
+        i, n = (int(x) for x in texto.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Formato de shard inválido: '{texto}' (se espera i/N)")
+    if n < 1 or not 1 <= i <= n:
+        raise argparse.ArgumentTypeError(f"Shard fuera de rango: '{texto}'")
+    return i, n
+
+def ruta_journal(corrida, shard, total):
+    return os.path.join(CARPETA_CORRIDAS, corrida, f"journal_{shard}_de_{total}.jsonl")
+
+def journals_de_corrida(corrida):
+    """
+    Devuelve {N: [rutas]} con los journals de la corrida agrupados por la
+    cantidad de shards con la que fueron creados.
+    """
+    grupos = {}
+    for ruta in glob.glob(os.path.join(CARPETA_CORRIDAS, corrida, "journal_*_de_*.jsonl")):
+        coincidencia = re.fullmatch(r"journal_(\d+)_de_(\d+)\.jsonl", os.path.basename(ruta))
+        if coincidencia:
+            grupos.setdefault(int(coincidencia.group(2)), []).append(ruta)
+    return grupos
+
+def leer_journal(ruta):
+    """
+    Devuelve un diccionario {simbolo: registro} con lo ya procesado.
+    Una línea incompleta (corte en medio de una escritura) se ignora.
+    """
+    registros = {}
+    if not os.path.exists(ruta):
+        return registros
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                continue
+            registros[registro["Simbolo"]] = registro
+    return registros
+
+def reparar_journal(ruta, bloque=4096):
+    """
+    Si la corrida anterior se cortó en medio de una escritura, el journal
+    termina en una línea incompleta. Se la recorta hasta el último salto de
+    línea para que el próximo registro no quede pegado a ella.
+    """
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, "rb+") as f:
+        fin = f.seek(0, os.SEEK_END)
+        posicion = fin
+        while posicion > 0:
+            inicio = max(0, posicion - bloque)
+            f.seek(inicio)
+            salto = f.read(posicion - inicio).rfind(b"\n")
+            if salto != -1:
+                posicion = inicio + salto + 1
+                break
+            posicion = inicio
+        if posicion < fin:
+            f.truncate(posicion)
+            f.flush()
+            os.fsync(f.fileno())
+
+def registrar(journal, registro):
+    """
+    Agrega un registro al journal y lo fuerza a disco antes de seguir.
+    """
+    journal.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    journal.flush()
+    os.fsync(journal.fileno())
+
+def redondear(valor):
+    return None if np.isnan(valor) else round(float(valor), 2)
+
+# === PROCESAMIENTO DE UN SIMBOLO ===
+def procesar_simbolo(simbolo):
+    data = yf.download(simbolo, period="2y", interval="1d", progress=False)
+
+    if data.empty:
+        return {"Simbolo": simbolo, "estado": "sin_datos", "rsi": None, "desvio": None}
+
+    # Las versiones nuevas de yfinance devuelven columnas (Precio, Símbolo)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+
+    # Calcular medias móviles
+    data["MA50"] = data["Close"].rolling(window=50).mean()
+    data["MA200"] = data["Close"].rolling(window=200).mean()
+
+    # Calcular RSI
+    data["RSI"] = calcular_rsi(data["Close"])
+    ultimo_rsi = redondear(data["RSI"].iloc[-1])
+
+    # Calcular máximos y mínimos locales
+    data["max_local"] = np.nan
+    data["min_local"] = np.nan
+    maxima_idx = argrelextrema(data["Close"].values, np.greater_equal, order=5)[0]
+    minima_idx = argrelextrema(data["Close"].values, np.less_equal, order=5)[0]
+    data.loc[data.index[maxima_idx], "max_local"] = data["Close"].iloc[maxima_idx]
+    data.loc[data.index[minima_idx], "min_local"] = data["Close"].iloc[minima_idx]
+
+    # Obtener máximos y mínimos globales
+    max_global = float(data["Close"].max())
+    min_global = float(data["Close"].min())
+    ultima = float(data["Close"].iloc[-1])
+
+    # Calcular desvíos porcentuales
+    desvio_max = ((ultima - max_global) / max_global) * 100
+    desvio_min = ((ultima - min_global) / min_global) * 100
+
+    graficar(simbolo, data, ultima, ultimo_rsi, desvio_max, desvio_min)
+
+    return {
+        "Simbolo": simbolo,
+        "estado": "ok",
+        "rsi": {"Simbolo": simbolo, "RSI": ultimo_rsi},
+        "desvio": {
+            "Simbolo": simbolo,
+            "Ultimo_Cierre": round(ultima, 2),
+            "Maximo_Serie": round(max_global, 2),
+            "Minimo_Serie": round(min_global, 2),
+            "Desvio_Max(%)": round(desvio_max, 2),
+            "Desvio_Min(%)": round(desvio_min, 2)
+        }
+    }
+
+def graficar(simbolo, data, ultima, ultimo_rsi, desvio_max, desvio_min):
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 7), sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+
+    # ----- Panel superior: cotización -----
+    ax1.plot(data.index, data["Close"], label="Cierre", color="blue", linewidth=1)
+    ax1.plot(data.index, data["MA50"], label="Media 50 ruedas", color="orange", linewidth=1.2)
+    ax1.plot(data.index, data["MA200"], label="Media 200 ruedas", color="purple", linewidth=1.2)
+    ax1.scatter(data.index, data["max_local"], color="red", label="Máximos parciales", marker="^")
+    ax1.scatter(data.index, data["min_local"], color="green", label="Mínimos parciales", marker="v")
+    ax1.axhline(y=ultima, color="gray", linestyle="--", linewidth=1, label=f"Último precio ({ultima:.2f})")
+    ax1.set_title(f"{simbolo} - Cotización últimos 2 años")
+    ax1.set_ylabel("Precio de Cierre (USD)")
+    ax1.legend()
+    ax1.grid(True)
+
+    # Texto con RSI y desvíos
+    texto_rsi = f"{ultimo_rsi:.2f}" if ultimo_rsi is not None else "N/A"
+    texto_info = (
+        f"RSI (14): {texto_rsi}\n"
+        f"Desvío Máx: {desvio_max:.2f}%\n"
+        f"Desvío Mín: {desvio_min:.2f}%"
+    )
+    ax1.text(0.02, 0.95, texto_info, transform=ax1.transAxes,
+             fontsize=9, verticalalignment='top', bbox=dict(facecolor='white', alpha=0.7, edgecolor='gray'))
+
+    # ----- Panel inferior: RSI -----
+    ax2.plot(data.index, data["RSI"], color="magenta", label="RSI (14)", linewidth=1)
+    ax2.axhline(70, color="red", linestyle="--", linewidth=1)
+    ax2.axhline(30, color="green", linestyle="--", linewidth=1)
+    ax2.set_ylabel("RSI (14)")
+    ax2.set_xlabel("Fecha")
+    ax2.legend()
+    ax2.grid(True)
+    ax2.set_ylim(0, 100)
+
+    plt.tight_layout()
+
+    ruta_img = os.path.join("graficos", f"{simbolo}.png")
+    plt.savefig(ruta_img)
+    plt.close(fig)
+    print(f"  ✓ Gráfico generado: {ruta_img}")
+
+# === UNIR JOURNALS Y GENERAR TABLAS FINALES ===
+def unir_resultados(simbolos, corrida, total):
+    """
+    Combina los journals de la corrida creados con 'total' shards y escribe
+    rsi.csv y desvio.csv respetando el orden de simbolos.txt. Los journals de
+    otras corridas, o de la misma con otra cantidad de shards, no se mezclan.
+    """
+    registros = {}
+    for shard in range(1, total + 1):
+        registros.update(leer_journal(ruta_journal(corrida, shard, total)))
+
+    resultados_rsi = []
+    resultados_desvio = []
+    pendientes = []
+    for simbolo in simbolos:
+        registro = registros.get(simbolo)
+        if registro is None or registro["estado"] == "error":
+            pendientes.append(simbolo)
+        elif registro["estado"] == "ok":
+            resultados_rsi.append(registro["rsi"])
+            resultados_desvio.append(registro["desvio"])
+
+    if pendientes:
+        print(f"⚠ {len(pendientes)} símbolos sin terminar: {', '.join(pendientes)}")
+
+    df_desvio = pd.DataFrame(resultados_desvio)
+    df_desvio.to_csv("desvio.csv", index=False, sep=";")
+    print(f"✓ Archivo 'desvio.csv' generado correctamente ({len(resultados_desvio)} registros)")
+
+    df_rsi = pd.DataFrame(resultados_rsi)
+    df_rsi.to_csv("rsi.csv", index=False, sep=";")
+    print(f"✓ Archivo 'rsi.csv' generado correctamente ({len(resultados_rsi)} registros)")
+
+# === ARGUMENTOS ===
+parser = argparse.ArgumentParser(description="Corrida reanudable y particionable sobre simbolos.txt")
+parser.add_argument("--shard", type=parsear_shard, default=(1, 1),
+                    help="porción a procesar, en formato i/N (por defecto 1/1)")
+parser.add_argument("--merge", action="store_true",
+                    help="solo une los journals de la corrida y genera las tablas finales")
+parser.add_argument("--reiniciar", action="store_true",
+                    help="descarta todos los journals de la corrida antes de empezar "
+                         "(con varios shards, usarlo solo al lanzar el primero)")
+parser.add_argument("--corrida", default=time.strftime("%Y-%m-%d"),
+                    help="identificador de la corrida (por defecto la fecha de hoy)")
+args = parser.parse_args()
+
+# Leer símbolos desde el archivo
+try:
+    with open("simbolos.txt", "r") as f:
+        simbolos = [line.strip().upper() for line in f if line.strip()]
+except FileNotFoundError:
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    sys.exit(1)
+
+os.makedirs(os.path.join(CARPETA_CORRIDAS, args.corrida), exist_ok=True)
+shard, total = args.shard
+
+if args.merge:
+    # Sin --shard se toma la cantidad de shards de los journals de la corrida
+    if total == 1:
+        cantidades = sorted(journals_de_corrida(args.corrida))
+        if len(cantidades) > 1:
+            print(f"Error: la corrida '{args.corrida}' tiene journals de {cantidades} shards; "
+                  f"indicar cuál unir con --shard 1/N")
+            sys.exit(1)
+        total = cantidades[0] if cantidades else 1
+    unir_resultados(simbolos, args.corrida, total)
+    sys.exit(0)
+
+os.makedirs("graficos", exist_ok=True)
+
+ruta = ruta_journal(args.corrida, shard, total)
+if args.reiniciar:
+    for rutas in journals_de_corrida(args.corrida).values():
+        for ruta_vieja in rutas:
+            os.remove(ruta_vieja)
+
+# Los símbolos se reparten de forma intercalada: el shard i toma las
+# posiciones i-1, i-1+N, i-1+2N, ... de simbolos.txt
+asignados = simbolos[shard - 1::total]
+reparar_journal(ruta)
+hechos = leer_journal(ruta)
+faltantes = [s for s in asignados if hechos.get(s, {}).get("estado") not in ("ok", "sin_datos")]
+
+print(f"Shard {shard}/{total}: {len(asignados)} símbolos asignados, "
+      f"{len(asignados) - len(faltantes)} ya terminados, {len(faltantes)} por procesar\n")
+
+with open(ruta, "a", encoding="utf-8") as journal:
+    for simbolo in faltantes:
+        print(f"Procesando {simbolo}...")
+        try:
+            registro = procesar_simbolo(simbolo)
+            if registro["estado"] == "sin_datos":
+                print(f"  ⚠ No se encontraron datos para {simbolo}")
+        except Exception as e:
+            print(f"  ✗ Error procesando {simbolo}: {str(e)}")
+            registro = {"Simbolo": simbolo, "estado": "error", "rsi": None, "desvio": None}
+        registrar(journal, registro)
+
+# Con un único shard la corrida está completa y se generan las tablas;
+# con varios shards hay que correr '--merge' cuando todos terminen.
+if total == 1:
+    unir_resultados(simbolos, args.corrida, total)
+else:
+    print(f"\nShard {shard}/{total} terminado. Ejecutar 'python prueba11.py --merge' al finalizar todos los shards.")
@@ -0,0 +1,206 @@
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Servicio local de consulta de resultados (solo biblioteca estándar).
+#
+# Carga en memoria las últimas métricas por símbolo a partir de rsi.csv y
+# desvio.csv (y ranking.csv de prueba21, si existe) y las recarga solas cuando
+# una corrida nueva reescribe esos archivos.
+#
+# Uso:
+#   python prueba12.py [--puerto 8765]
+#
+# Consultas:
+#   GET /simbolo/PFE                -> métricas de un símbolo
+#   GET /simbolos?lista=PFE,BAC     -> métricas de varios símbolos
+#   GET /simbolos                   -> todos los símbolos cargados
+#   GET /estado                     -> cantidad de símbolos y hora de la última carga
+
+ARCHIVO_RSI = "rsi.csv"
+ARCHIVO_DESVIO = "desvio.csv"
+ARCHIVO_RANKING = "ranking.csv"
+COLUMNAS_DESVIO = ["Desvio_Max(%)", "Desvio_Min(%)", "Ultimo_Cierre", "Maximo_Serie", "Minimo_Serie"]
+
+# === FUNCION PARA DETERMINAR SEÑAL ===
+def generar_senal(rsi):
+    if rsi < 30:
+        return "COMPRA"
+    elif rsi > 70:
+        return "VENTA"
+    else:
+        return "NEUTRO"
+
+# === LECTURA DE LOS CSV ===
+def a_numero(texto):
+    """
+    Convierte un valor del CSV a float; vacío, 'N/A' o 'nan' se devuelven como None.
+    """
+    try:
+        valor = float(texto)
+    except (TypeError, ValueError):
+        return None
+    return None if valor != valor else valor
+
+def leer_tabla(ruta):
+    """
+    Lee un CSV de resultados separado por ';' (o ',' en las primeras pruebas)
+    y devuelve un diccionario {simbolo: fila}.
+    """
+    filas = {}
+    if not os.path.exists(ruta):
+        return filas
+    with open(ruta, "r", encoding="utf-8-sig", newline="") as f:
+        encabezado = f.readline()
+        separador = ";" if ";" in encabezado else ","
+        f.seek(0)
+        for fila in csv.DictReader(f, delimiter=separador):
+            simbolo = (fila.get("Simbolo") or "").strip().upper()
+            if simbolo:
+                filas[simbolo] = fila
+    return filas
+
+def cargar_metricas():
+    """
+    Une rsi.csv, desvio.csv y ranking.csv en un diccionario {simbolo: JSON ya codificado}.
+    Las respuestas se serializan una sola vez por carga para que cada consulta
+    sea solo una búsqueda en el diccionario.
+    """
+    tabla_rsi = leer_tabla(ARCHIVO_RSI)
+    tabla_desvio = leer_tabla(ARCHIVO_DESVIO)
+    tabla_ranking = leer_tabla(ARCHIVO_RANKING)
+
+    metricas = {}
+    for simbolo in list(tabla_rsi) + [s for s in tabla_desvio if s not in tabla_rsi]:
+        rsi = a_numero(tabla_rsi.get(simbolo, {}).get("RSI"))
+        registro = {
+            "Simbolo": simbolo,
+            "RSI": rsi,
+            "Senal": generar_senal(rsi) if rsi is not None else None,
+        }
+        fila_desvio = tabla_desvio.get(simbolo, {})
+        for columna in COLUMNAS_DESVIO:
+            registro[columna] = a_numero(fila_desvio.get(columna))
+        for columna, valor in tabla_ranking.get(simbolo, {}).items():
+            if columna != "Simbolo":
+                registro[columna] = a_numero(valor)
+        metricas[simbolo] = json.dumps(registro, ensure_ascii=False).encode("utf-8")
+    return metricas
+
+def firma_archivos():
+    """
+    Identifica la versión actual de los CSV por fecha de modificación y tamaño.
+    """
+    firma = []
+    for ruta in (ARCHIVO_RSI, ARCHIVO_DESVIO, ARCHIVO_RANKING):
+        try:
+            estado = os.stat(ruta)
+            firma.append((estado.st_mtime_ns, estado.st_size))
+        except FileNotFoundError:
+            firma.append(None)
+    return tuple(firma)
+
+# === ALMACEN EN MEMORIA ===
+class AlmacenMetricas:
+    """
+    Guarda las últimas métricas por símbolo. Cada recarga arma un diccionario
+    nuevo y lo reemplaza de una sola vez, así las consultas nunca ven una
+    carga a medias y no necesitan bloqueo.
+    """
+
+    def __init__(self):
+        self.metricas = {}
+        self.firma = None
+        self.cargado = None
+
+    def recargar(self, firma):
+        self.metricas = cargar_metricas()
+        self.firma = firma
+        self.cargado = time.strftime("%Y-%m-%d %H:%M:%S")
+        print(f"✓ Métricas cargadas: {len(self.metricas)} símbolos ({self.cargado})")
+
+    def vigilar(self, intervalo):
+        """
+        Revisa los CSV cada 'intervalo' segundos. Solo recarga cuando la firma
+        cambió y se mantuvo igual entre dos revisiones, para no leer un archivo
+        que la corrida todavía está escribiendo.
+        """
+        firma_previa = self.firma
+        while True:
+            time.sleep(intervalo)
+            firma = firma_archivos()
+            if firma != self.firma and firma == firma_previa:
+                try:
+                    self.recargar(firma)
+                except Exception as e:
+                    print(f"✗ Error recargando métricas: {e}")
+            firma_previa = firma
+
+# === SERVIDOR HTTP ===
+class ManejadorConsultas(BaseHTTPRequestHandler):
+    almacen = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        partes = [p for p in url.path.split("/") if p]
+        metricas = self.almacen.metricas
+
+        if len(partes) == 2 and partes[0] == "simbolo":
+            cuerpo = metricas.get(partes[1].upper())
+            if cuerpo is None:
+                self.responder(404, b'{"error": "simbolo no encontrado"}')
+            else:
+                self.responder(200, cuerpo)
+        elif partes == ["simbolos"]:
+            lista = parse_qs(url.query).get("lista")
+            if lista:
+                simbolos = [s.strip().upper() for s in ",".join(lista).split(",") if s.strip()]
+            else:
+                simbolos = list(metricas)
+            # La clave se codifica con json.dumps: el símbolo viene de la consulta
+            # y puede traer comillas, barras o caracteres de control
+            items = [json.dumps(s, ensure_ascii=False).encode("utf-8") + b": " + metricas.get(s, b"null")
+                     for s in simbolos]
+            self.responder(200, b"{" + b", ".join(items) + b"}")
+        elif partes == ["estado"]:
+            estado = {"simbolos": len(metricas), "cargado": self.almacen.cargado}
+            self.responder(200, json.dumps(estado).encode("utf-8"))
+        else:
+            self.responder(404, b'{"error": "ruta desconocida"}')
+
+    def responder(self, codigo, cuerpo):
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        # Sin un print por consulta: en lotes grandes domina el tiempo de respuesta
+        pass
+
+# === ARGUMENTOS ===
+parser = argparse.ArgumentParser(description="Servicio local de métricas por símbolo")
+parser.add_argument("--puerto", type=int, default=8765, help="puerto local (por defecto 8765)")
+parser.add_argument("--intervalo", type=float, default=1.0,
+                    help="segundos entre revisiones de los CSV (por defecto 1)")
+args = parser.parse_args()
+
+almacen = AlmacenMetricas()
+almacen.recargar(firma_archivos())
+threading.Thread(target=almacen.vigilar, args=(args.intervalo,), daemon=True).start()
+
+ManejadorConsultas.almacen = almacen
+servidor = ThreadingHTTPServer(("127.0.0.1", args.puerto), ManejadorConsultas)
+print(f"Servicio escuchando en http://127.0.0.1:{args.puerto}/ (Ctrl+C para salir)")
+try:
+    servidor.serve_forever()
+except KeyboardInterrupt:
+    print("\nServicio detenido.")
+finally:
+    servidor.server_close()
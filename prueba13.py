@@ -0,0 +1,180 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import os
+import sys
+
+# Matrices de correlación y covarianza de retornos para todo el universo.
+#
+# Se descarga el panel de cierres de todos los símbolos de una vez y se
+# calculan las matrices por bloques de columnas, de modo que la memoria de
+# trabajo depende del tamaño del bloque y no de la cantidad de símbolos.
+# Los datos faltantes se tratan por pares: cada par usa solo las fechas en
+# que ambos símbolos tienen retorno.
+#
+# Uso:
+#   python prueba13.py [--ventana 60] [--bloque 512] [--top 10]
+#
+# Salidas en la carpeta 'correlacion/':
+#   correlacion.npy / covarianza.npy             -> período completo (float32)
+#   correlacion_<V>.npy / covarianza_<V>.npy     -> últimas V ruedas (float32)
+#   simbolos.json                                -> orden de filas y columnas
+#   top_correlacionados.csv                      -> los k más correlacionados por símbolo
+
+CARPETA_SALIDA = "correlacion"
+
+# === MATRICES POR BLOQUES ===
+def matrices_por_bloques(retornos, ruta_corr, ruta_cov, bloque=512, min_obs=20):
+    """
+    Calcula correlación y covarianza por pares sobre una matriz de retornos
+    (fechas x símbolos) con NaN donde falta el dato.
+
+    Para cada par de bloques de columnas (A, B) se usan solo productos de
+    matrices entre la máscara de datos válidos M y los retornos con ceros en
+    lugar de NaN, X:
+        n    = M_A' M_B        sx  = X_A' M_B       sy  = M_A' X_B
+        sxy  = X_A' X_B        sxx = (X_A²)' M_B    syy = M_A' (X_B²)
+    Los resultados se escriben en archivos .npy mapeados a memoria en float32.
+    Los pares con menos de 'min_obs' observaciones comunes quedan en NaN.
+    """
+    mascara = ~np.isnan(retornos)
+    m = mascara.astype(np.float64)
+    x = np.where(mascara, retornos, 0.0)
+    x2 = x * x
+    n_simbolos = retornos.shape[1]
+
+    corr = np.lib.format.open_memmap(ruta_corr, mode="w+", dtype=np.float32, shape=(n_simbolos, n_simbolos))
+    cov = np.lib.format.open_memmap(ruta_cov, mode="w+", dtype=np.float32, shape=(n_simbolos, n_simbolos))
+
+    for i in range(0, n_simbolos, bloque):
+        a = slice(i, min(i + bloque, n_simbolos))
+        for j in range(i, n_simbolos, bloque):
+            b = slice(j, min(j + bloque, n_simbolos))
+
+            n = m[:, a].T @ m[:, b]
+            sx = x[:, a].T @ m[:, b]
+            sy = m[:, a].T @ x[:, b]
+            sxy = x[:, a].T @ x[:, b]
+            sxx = x2[:, a].T @ m[:, b]
+            syy = m[:, a].T @ x2[:, b]
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                cov_ab = (sxy - sx * sy / n) / (n - 1)
+                var_x = sxx - sx * sx / n
+                var_y = syy - sy * sy / n
+                corr_ab = (sxy - sx * sy / n) / np.sqrt(var_x * var_y)
+
+            insuficiente = n < min_obs
+            cov_ab[insuficiente] = np.nan
+            corr_ab[insuficiente] = np.nan
+            np.clip(corr_ab, -1.0, 1.0, out=corr_ab)
+
+            # La matriz es simétrica: el bloque (j, i) es el traspuesto de (i, j)
+            cov[a, b] = cov_ab
+            corr[a, b] = corr_ab
+            cov[b, a] = cov_ab.T
+            corr[b, a] = corr_ab.T
+
+    corr.flush()
+    cov.flush()
+    return corr, cov
+
+# === CONSULTA TOP-K ===
+def top_correlacionados(corr, simbolos, k=10, bloque=512):
+    """
+    Devuelve un DataFrame con los k símbolos más correlacionados con cada uno,
+    procesando la matriz por bloques de filas.
+    """
+    n_simbolos = len(simbolos)
+    k = min(k, n_simbolos - 1)
+    nombres = np.asarray(simbolos)
+    filas = []
+    if k < 1:
+        return pd.DataFrame(filas)
+
+    for i in range(0, n_simbolos, bloque):
+        filas_bloque = np.array(corr[i:i + bloque], dtype=np.float32)
+        indices = np.arange(i, i + len(filas_bloque))
+        # Excluir la diagonal y los pares sin datos suficientes
+        filas_bloque[indices - i, indices] = -np.inf
+        filas_bloque[np.isnan(filas_bloque)] = -np.inf
+
+        candidatos = np.argpartition(-filas_bloque, k - 1, axis=1)[:, :k]
+        valores = np.take_along_axis(filas_bloque, candidatos, axis=1)
+        orden = np.argsort(-valores, axis=1)
+        candidatos = np.take_along_axis(candidatos, orden, axis=1)
+        valores = np.take_along_axis(valores, orden, axis=1)
+
+        for fila, simbolo in enumerate(nombres[indices]):
+            for puesto in range(k):
+                if np.isfinite(valores[fila, puesto]):
+                    filas.append({
+                        "Simbolo": simbolo,
+                        "Puesto": puesto + 1,
+                        "Correlacionado": nombres[candidatos[fila, puesto]],
+                        "Correlacion": round(float(valores[fila, puesto]), 4)
+                    })
+    return pd.DataFrame(filas)
+
+# === ARGUMENTOS ===
+parser = argparse.ArgumentParser(description="Correlación y covarianza de retornos del universo")
+parser.add_argument("--ventana", type=int, default=60, help="ruedas de la ventana móvil más reciente (por defecto 60)")
+parser.add_argument("--bloque", type=int, default=512, help="columnas por bloque (por defecto 512)")
+parser.add_argument("--top", type=int, default=10, help="cantidad de correlacionados por símbolo (por defecto 10)")
+parser.add_argument("--min-obs", type=int, default=20, help="observaciones comunes mínimas por par (por defecto 20)")
+args = parser.parse_args()
+
+# Leer símbolos desde el archivo
+try:
+    with open("simbolos.txt", "r") as f:
+        simbolos = [line.strip().upper() for line in f if line.strip()]
+except FileNotFoundError:
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    sys.exit(1)
+
+os.makedirs(CARPETA_SALIDA, exist_ok=True)
+
+# === PANEL DE CIERRES ===
+print(f"Descargando cierres de {len(simbolos)} símbolos...")
+data = yf.download(simbolos, period="2y", interval="1d", progress=False)
+if data.empty:
+    print("⚠ No se encontraron datos")
+    sys.exit(1)
+
+cierres = data["Close"]
+if isinstance(cierres, pd.Series):
+    cierres = cierres.to_frame(simbolos[0])
+cierres = cierres.dropna(axis=1, how="all")
+simbolos_panel = [str(s) for s in cierres.columns]
+print(f"Panel: {cierres.shape[0]} ruedas x {cierres.shape[1]} símbolos")
+
+# Retornos diarios; fill_method=None para no inventar retornos en huecos
+retornos = cierres.pct_change(fill_method=None).iloc[1:].to_numpy(dtype=np.float64)
+del data, cierres
+
+with open(os.path.join(CARPETA_SALIDA, "simbolos.json"), "w", encoding="utf-8") as f:
+    json.dump(simbolos_panel, f)
+
+# === PERIODO COMPLETO ===
+corr, cov = matrices_por_bloques(
+    retornos,
+    os.path.join(CARPETA_SALIDA, "correlacion.npy"),
+    os.path.join(CARPETA_SALIDA, "covarianza.npy"),
+    bloque=args.bloque, min_obs=args.min_obs)
+print("✓ Matrices del período completo guardadas")
+
+df_top = top_correlacionados(corr, simbolos_panel, k=args.top, bloque=args.bloque)
+df_top.to_csv(os.path.join(CARPETA_SALIDA, "top_correlacionados.csv"), index=False, sep=";")
+print(f"✓ Archivo 'top_correlacionados.csv' generado ({len(df_top)} registros)")
+
+# === VENTANA MOVIL MAS RECIENTE ===
+matrices_por_bloques(
+    retornos[-args.ventana:],
+    os.path.join(CARPETA_SALIDA, f"correlacion_{args.ventana}.npy"),
+    os.path.join(CARPETA_SALIDA, f"covarianza_{args.ventana}.npy"),
+    bloque=args.bloque, min_obs=min(args.min_obs, args.ventana))
+print(f"✓ Matrices de las últimas {args.ventana} ruedas guardadas")
+
+print(f"\nResultados en la carpeta '{CARPETA_SALIDA}/'")
@@ -0,0 +1,209 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.signal import argrelextrema
+import os
+import sys
+
+# Misma corrida que prueba09 (RSI, medias móviles, extremos locales, desvíos
+# y gráfico de dos paneles), pero sin agregar columnas al DataFrame descargado.
+# Cada símbolo se guarda en una SerieCompacta: arreglos float32 contiguos para
+# cierre, medias y RSI, y los extremos locales como arreglos de índices en
+# lugar de columnas casi enteramente NaN.
+
+# === SERIE COMPACTA ===
+class SerieCompacta:
+    """
+    Serie de un símbolo con sus indicadores.
+
+    fechas  : días desde 1970-01-01 (int32)
+    cierre, ma50, ma200, rsi : float32
+    idx_max, idx_min : posiciones de los máximos y mínimos locales (int32)
+    """
+    __slots__ = ("simbolo", "fechas", "cierre", "ma50", "ma200", "rsi", "idx_max", "idx_min")
+
+    def __init__(self, simbolo, fechas, cierre):
+        self.simbolo = simbolo
+        self.fechas = np.ascontiguousarray(fechas, dtype=np.int32)
+        self.cierre = np.ascontiguousarray(cierre, dtype=np.float32)
+
+        # Los cálculos se hacen en float64 y solo se guarda el resultado en float32
+        precios = self.cierre.astype(np.float64)
+        self.ma50 = media_movil(precios, 50)
+        self.ma200 = media_movil(precios, 200)
+        self.rsi = calcular_rsi(precios)
+        self.idx_max = argrelextrema(precios, np.greater_equal, order=5)[0].astype(np.int32)
+        self.idx_min = argrelextrema(precios, np.less_equal, order=5)[0].astype(np.int32)
+
+    @classmethod
+    def desde_descarga(cls, simbolo, data):
+        """
+        Construye la serie a partir del DataFrame de yf.download sin modificarlo.
+        """
+        dias = data.index.values.astype("datetime64[D]").astype(np.int64)
+        cierre = data["Close"].to_numpy().ravel()
+        return cls(simbolo, dias, cierre)
+
+    def fechas_datetime(self):
+        return self.fechas.astype("datetime64[D]")
+
+    def nbytes(self):
+        return sum(getattr(self, campo).nbytes for campo in self.__slots__[1:])
+
+# === INDICADORES SOBRE ARREGLOS ===
+def media_movil(valores, ventana):
+    """
+    Media móvil simple con sumas acumuladas; las primeras ventana-1 posiciones quedan en NaN.
+    Como rolling().mean() de pandas, solo las ventanas que contienen un NaN
+    quedan en NaN: los NaN se suman como 0 y se cuentan aparte, para que no
+    se arrastren por el acumulado hasta el final de la serie.
+    """
+    resultado = np.full(len(valores), np.nan, dtype=np.float32)
+    if len(valores) >= ventana:
+        validos = ~np.isnan(valores)
+        acumulado = np.concatenate(([0.0], np.cumsum(np.where(validos, valores, 0.0))))
+        cantidad = np.concatenate(([0], np.cumsum(validos)))
+        completas = (cantidad[ventana:] - cantidad[:-ventana]) == ventana
+        resultado[ventana - 1:] = np.where(completas, (acumulado[ventana:] - acumulado[:-ventana]) / ventana, np.nan)
+    return resultado
+
+def calcular_rsi(valores, periodo=14):
+    """
+    RSI con medias simples de ganancias y pérdidas, como en prueba09.
+    """
+    # La primera rueda no tiene diferencia: igual que en pandas, cuenta como 0
+    delta = np.diff(valores, prepend=valores[:1])
+    ganancia = np.where(delta > 0, delta, 0.0)
+    perdida = np.where(delta < 0, -delta, 0.0)
+
+    media_gan = media_movil(ganancia, periodo).astype(np.float64)
+    media_per = media_movil(perdida, periodo).astype(np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = media_gan / media_per
+        rsi = 100 - (100 / (1 + rs))
+    return rsi.astype(np.float32)
+
+# === GRAFICO ===
+def graficar(serie, ultima, ultimo_rsi, desvio_max, desvio_min):
+    fechas = serie.fechas_datetime()
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 7), sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+
+    # ----- Panel superior: cotización -----
+    ax1.plot(fechas, serie.cierre, label="Cierre", color="blue", linewidth=1)
+    ax1.plot(fechas, serie.ma50, label="Media 50 ruedas", color="orange", linewidth=1.2)
+    ax1.plot(fechas, serie.ma200, label="Media 200 ruedas", color="purple", linewidth=1.2)
+    ax1.scatter(fechas[serie.idx_max], serie.cierre[serie.idx_max], color="red", label="Máximos parciales", marker="^")
+    ax1.scatter(fechas[serie.idx_min], serie.cierre[serie.idx_min], color="green", label="Mínimos parciales", marker="v")
+    ax1.axhline(y=ultima, color="gray", linestyle="--", linewidth=1, label=f"Último precio ({ultima:.2f})")
+    ax1.set_title(f"{serie.simbolo} - Cotización últimos 2 años")
+    ax1.set_ylabel("Precio de Cierre (USD)")
+    ax1.legend()
+    ax1.grid(True)
+
+    # Texto con RSI y desvíos
+    texto_info = (
+        f"RSI (14): {ultimo_rsi:.2f}\n"
+        f"Desvío Máx: {desvio_max:.2f}%\n"
+        f"Desvío Mín: {desvio_min:.2f}%"
+    )
+    ax1.text(0.02, 0.95, texto_info, transform=ax1.transAxes,
+             fontsize=9, verticalalignment='top', bbox=dict(facecolor='white', alpha=0.7, edgecolor='gray'))
+
+    # ----- Panel inferior: RSI -----
+    ax2.plot(fechas, serie.rsi, color="magenta", label="RSI (14)", linewidth=1)
+    ax2.axhline(70, color="red", linestyle="--", linewidth=1)
+    ax2.axhline(30, color="green", linestyle="--", linewidth=1)
+    ax2.set_ylabel("RSI (14)")
+    ax2.set_xlabel("Fecha")
+    ax2.legend()
+    ax2.grid(True)
+    ax2.set_ylim(0, 100)
+
+    plt.tight_layout()
+
+    ruta_img = os.path.join("graficos", f"{serie.simbolo}.png")
+    plt.savefig(ruta_img)
+    plt.close(fig)
+    print(f"  ✓ Gráfico generado: {ruta_img}")
+
+# Crear carpeta para guardar gráficos
+os.makedirs("graficos", exist_ok=True)
+
+# Leer símbolos desde el archivo
+try:
+    with open("simbolos.txt", "r") as f:
+        simbolos = [line.strip().upper() for line in f if line.strip()]
+except FileNotFoundError:
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    sys.exit(1)
+
+# Crear listas para guardar resultados
+resultados_desvio = []
+resultados_rsi = []
+bytes_compactos = 0
+bytes_ensanchados = 0
+
+for simbolo in simbolos:
+    print(f"Procesando {simbolo}...")
+
+    try:
+        data = yf.download(simbolo, period="2y", interval="1d", progress=False)
+
+        if data.empty:
+            print(f"  ⚠ No se encontraron datos para {simbolo}")
+            continue
+
+        serie = SerieCompacta.desde_descarga(simbolo, data)
+        # Lo que ocuparía el DataFrame con las 5 columnas float64 que agregaba prueba09
+        bytes_ensanchados += int(data.memory_usage(deep=True).sum()) + 5 * 8 * len(data)
+        bytes_compactos += serie.nbytes()
+        del data
+
+        ultimo_rsi = float(serie.rsi[-1])
+        resultados_rsi.append({
+            "Simbolo": simbolo,
+            "RSI": round(ultimo_rsi, 2) if not np.isnan(ultimo_rsi) else np.nan
+        })
+
+        # Obtener máximos y mínimos globales
+        # nanmax/nanmin: como .max()/.min() de pandas, un cierre faltante no cuenta
+        max_global = float(np.nanmax(serie.cierre))
+        min_global = float(np.nanmin(serie.cierre))
+        ultima = float(serie.cierre[-1])
+
+        # Calcular desvíos porcentuales
+        desvio_max = ((ultima - max_global) / max_global) * 100
+        desvio_min = ((ultima - min_global) / min_global) * 100
+
+        resultados_desvio.append({
+            "Simbolo": simbolo,
+            "Ultimo_Cierre": round(ultima, 2),
+            "Maximo_Serie": round(max_global, 2),
+            "Minimo_Serie": round(min_global, 2),
+            "Desvio_Max(%)": round(desvio_max, 2),
+            "Desvio_Min(%)": round(desvio_min, 2)
+        })
+
+        graficar(serie, ultima, ultimo_rsi, desvio_max, desvio_min)
+
+    except Exception as e:
+        print(f"  ✗ Error procesando {simbolo}: {str(e)}")
+        continue
+
+# === GUARDAR RESULTADOS ===
+df_desvio = pd.DataFrame(resultados_desvio)
+df_desvio.to_csv("desvio.csv", index=False, sep=";")
+print("\nArchivo 'desvio.csv' generado correctamente.")
+
+df_rsi = pd.DataFrame(resultados_rsi)
+df_rsi.to_csv("rsi.csv", index=False, sep=";")
+print("Archivo 'rsi.csv' generado correctamente.")
+
+if bytes_compactos:
+    print(f"Memoria por series: {bytes_compactos / 1024:.1f} KB compactas "
+          f"vs {bytes_ensanchados / 1024:.1f} KB con columnas agregadas "
+          f"({bytes_ensanchados / bytes_compactos:.1f}x)")
+
+print("Todos los gráficos se guardaron en la carpeta 'graficos/'.")
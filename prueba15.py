@@ -0,0 +1,215 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.signal import argrelextrema
+import argparse
+import csv
+import os
+import queue
+import threading
+
+# Modo streaming con memoria constante.
+#
+# La corrida es una cadena de generadores: leer símbolos -> descargar ->
+# calcular -> graficar -> escribir. Entre etapas hay una cola acotada, así
+# que en todo momento hay como máximo unos pocos símbolos en memoria, sin
+# importar cuántos tenga simbolos.txt. Las filas de rsi.csv y desvio.csv se
+# escriben a medida que salen, en lugar de acumularse en listas.
+#
+# Uso:
+#   python prueba15.py [--capacidad 4] [--sin-graficos]
+
+# === FUNCION PARA CALCULAR RSI MANUALMENTE ===
+def calcular_rsi(series, periodo=14):
+    delta = series.diff()
+    ganancia = delta.where(delta > 0, 0)
+    perdida = -delta.where(delta < 0, 0)
+
+    media_gan = ganancia.rolling(window=periodo).mean()
+    media_per = perdida.rolling(window=periodo).mean()
+
+    rs = media_gan / media_per
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+# === COLA ACOTADA ENTRE ETAPAS ===
+_FIN = object()
+
+def en_hilo(etapa, capacidad):
+    """
+    Ejecuta un generador en un hilo aparte y devuelve otro generador que lee
+    sus resultados desde una cola de tamaño 'capacidad'. Si la etapa siguiente
+    va más lenta, put() bloquea y la etapa anterior espera (contrapresión).
+    Una excepción en la etapa se vuelve a lanzar del lado del consumidor.
+    """
+    cola = queue.Queue(maxsize=capacidad)
+
+    def producir():
+        try:
+            for item in etapa:
+                cola.put(item)
+        except BaseException as e:
+            cola.put(e)
+        finally:
+            cola.put(_FIN)
+
+    threading.Thread(target=producir, daemon=True).start()
+
+    while True:
+        item = cola.get()
+        if item is _FIN:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+# === ETAPAS ===
+def leer_simbolos(ruta):
+    with open(ruta, "r") as f:
+        for line in f:
+            if line.strip():
+                yield line.strip().upper()
+
+def descargar(simbolos):
+    for simbolo in simbolos:
+        print(f"Procesando {simbolo}...")
+        try:
+            data = yf.download(simbolo, period="2y", interval="1d", progress=False)
+        except Exception as e:
+            print(f"  ✗ Error descargando {simbolo}: {str(e)}")
+            continue
+        if data.empty:
+            print(f"  ⚠ No se encontraron datos para {simbolo}")
+            continue
+        # Solo sigue adelante la serie de cierre; el resto del DataFrame se libera acá
+        cierre = pd.Series(data["Close"].to_numpy().ravel(), index=data.index, name=simbolo)
+        del data
+        yield {"simbolo": simbolo, "cierre": cierre}
+
+def calcular(trozos):
+    for trozo in trozos:
+        simbolo = trozo["simbolo"]
+        cierre = trozo["cierre"]
+        try:
+            rsi = calcular_rsi(cierre)
+            ultimo_rsi = float(rsi.iloc[-1])
+
+            max_global = float(cierre.max())
+            min_global = float(cierre.min())
+            ultima = float(cierre.iloc[-1])
+            desvio_max = ((ultima - max_global) / max_global) * 100
+            desvio_min = ((ultima - min_global) / min_global) * 100
+
+            trozo.update({
+                "rsi": rsi,
+                "ma50": cierre.rolling(window=50).mean(),
+                "ma200": cierre.rolling(window=200).mean(),
+                "maxima_idx": argrelextrema(cierre.values, np.greater_equal, order=5)[0],
+                "minima_idx": argrelextrema(cierre.values, np.less_equal, order=5)[0],
+                "fila_rsi": [simbolo, round(ultimo_rsi, 2) if not np.isnan(ultimo_rsi) else ""],
+                "fila_desvio": [simbolo, round(ultima, 2), round(max_global, 2), round(min_global, 2),
+                                round(desvio_max, 2), round(desvio_min, 2)],
+            })
+        except Exception as e:
+            print(f"  ✗ Error procesando {simbolo}: {str(e)}")
+            continue
+        yield trozo
+
+def graficar(trozos, con_graficos=True):
+    """
+    Dibuja el gráfico de cada símbolo y pasa adelante solo las filas de
+    resultados, soltando las series completas.
+    """
+    for trozo in trozos:
+        if con_graficos:
+            try:
+                dibujar(trozo)
+            except Exception as e:
+                print(f"  ✗ Error graficando {trozo['simbolo']}: {str(e)}")
+        yield trozo["fila_rsi"], trozo["fila_desvio"]
+
+def dibujar(trozo):
+    simbolo = trozo["simbolo"]
+    cierre = trozo["cierre"]
+    ultima = float(cierre.iloc[-1])
+    maxima_idx = trozo["maxima_idx"]
+    minima_idx = trozo["minima_idx"]
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 7), sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+
+    # ----- Panel superior: cotización -----
+    ax1.plot(cierre.index, cierre.values, label="Cierre", color="blue", linewidth=1)
+    ax1.plot(cierre.index, trozo["ma50"].values, label="Media 50 ruedas", color="orange", linewidth=1.2)
+    ax1.plot(cierre.index, trozo["ma200"].values, label="Media 200 ruedas", color="purple", linewidth=1.2)
+    ax1.scatter(cierre.index[maxima_idx], cierre.values[maxima_idx], color="red", label="Máximos parciales", marker="^")
+    ax1.scatter(cierre.index[minima_idx], cierre.values[minima_idx], color="green", label="Mínimos parciales", marker="v")
+    ax1.axhline(y=ultima, color="gray", linestyle="--", linewidth=1, label=f"Último precio ({ultima:.2f})")
+    ax1.set_title(f"{simbolo} - Cotización últimos 2 años")
+    ax1.set_ylabel("Precio de Cierre (USD)")
+    ax1.legend()
+    ax1.grid(True)
+
+    # ----- Panel inferior: RSI -----
+    ax2.plot(cierre.index, trozo["rsi"].values, color="magenta", label="RSI (14)", linewidth=1)
+    ax2.axhline(70, color="red", linestyle="--", linewidth=1)
+    ax2.axhline(30, color="green", linestyle="--", linewidth=1)
+    ax2.set_ylabel("RSI (14)")
+    ax2.set_xlabel("Fecha")
+    ax2.legend()
+    ax2.grid(True)
+    ax2.set_ylim(0, 100)
+
+    plt.tight_layout()
+
+    ruta_img = os.path.join("graficos", f"{simbolo}.png")
+    plt.savefig(ruta_img)
+    plt.close(fig)
+    print(f"  ✓ Gráfico generado: {ruta_img}")
+
+def escribir(filas, ruta_rsi, ruta_desvio):
+    """
+    Escribe cada fila apenas llega. Devuelve la cantidad de símbolos escritos.
+    """
+    cantidad = 0
+    with open(ruta_rsi, "w", newline="", encoding="utf-8") as f_rsi, \
+         open(ruta_desvio, "w", newline="", encoding="utf-8") as f_desvio:
+        escritor_rsi = csv.writer(f_rsi, delimiter=";")
+        escritor_desvio = csv.writer(f_desvio, delimiter=";")
+        escritor_rsi.writerow(["Simbolo", "RSI"])
+        escritor_desvio.writerow(["Simbolo", "Ultimo_Cierre", "Maximo_Serie", "Minimo_Serie",
+                                  "Desvio_Max(%)", "Desvio_Min(%)"])
+        for fila_rsi, fila_desvio in filas:
+            escritor_rsi.writerow(fila_rsi)
+            escritor_desvio.writerow(fila_desvio)
+            f_rsi.flush()
+            f_desvio.flush()
+            cantidad += 1
+    return cantidad
+
+# === ARGUMENTOS ===
+parser = argparse.ArgumentParser(description="Corrida en streaming con memoria constante")
+parser.add_argument("--capacidad", type=int, default=4,
+                    help="símbolos en espera entre cada par de etapas (por defecto 4)")
+parser.add_argument("--sin-graficos", action="store_true", help="no generar gráficos")
+args = parser.parse_args()
+
+if not os.path.exists("simbolos.txt"):
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    exit(1)
+
+os.makedirs("graficos", exist_ok=True)
+
+# === ARMAR Y EJECUTAR LA CADENA ===
+etapa = leer_simbolos("simbolos.txt")
+etapa = en_hilo(descargar(etapa), args.capacidad)
+etapa = en_hilo(calcular(etapa), args.capacidad)
+# matplotlib no es seguro fuera del hilo principal: el gráfico corre en el
+# mismo hilo que la escritura, tirando de la cola de la etapa de cálculo
+etapa = graficar(etapa, con_graficos=not args.sin_graficos)
+
+cantidad = escribir(etapa, "rsi.csv", "desvio.csv")
+
+print(f"\n✓ Archivos 'rsi.csv' y 'desvio.csv' generados correctamente ({cantidad} registros)")
+if not args.sin_graficos:
+    print("Todos los gráficos se guardaron en la carpeta 'graficos/'.")
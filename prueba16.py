@@ -0,0 +1,175 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+from scipy.signal import argrelextrema
+import json
+import os
+import sys
+
+# Salida incremental: solo lo que cambió desde la corrida anterior.
+#
+# Se guarda un estado compacto por símbolo en 'estado_senales.json' y en cada
+# corrida se compara contra él. En 'cambios.csv' quedan únicamente:
+#   CAMBIO_SENAL          la señal pasó entre NEUTRO / COMPRA / VENTA
+#   CRUCE_RSI_<umbral>    el RSI cruzó 30, 50 o 70 (Actual indica el nuevo valor)
+#   NUEVO_MAXIMO_LOCAL    se confirmó un máximo parcial más reciente
+#   NUEVO_MINIMO_LOCAL    se confirmó un mínimo parcial más reciente
+#   NUEVO_MAXIMO_SERIE    el máximo de la serie subió
+#   NUEVO_MINIMO_SERIE    el mínimo de la serie bajó
+#   NUEVO_SIMBOLO         el símbolo no estaba en la corrida anterior
+
+ARCHIVO_ESTADO = "estado_senales.json"
+ARCHIVO_CAMBIOS = "cambios.csv"
+UMBRALES_RSI = (30, 50, 70)
+
+# El estado de cada símbolo es una lista corta en este orden
+CAMPOS_ESTADO = ("rsi", "senal", "ultimo_max_local", "ultimo_min_local", "max_serie", "min_serie")
+
+# === FUNCION PARA CALCULAR RSI MANUALMENTE ===
+def calcular_rsi(series, periodo=14):
+    delta = series.diff()
+    ganancia = delta.where(delta > 0, 0)
+    perdida = -delta.where(delta < 0, 0)
+
+    media_gan = ganancia.rolling(window=periodo).mean()
+    media_per = perdida.rolling(window=periodo).mean()
+
+    rs = media_gan / media_per
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+# === FUNCION PARA DETERMINAR SEÑAL ===
+def generar_senal(rsi):
+    if rsi < 30:
+        return "COMPRA"
+    elif rsi > 70:
+        return "VENTA"
+    else:
+        return "NEUTRO"
+
+# === ESTADO ===
+def leer_estado(ruta):
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def guardar_estado(ruta, estado):
+    """
+    Escribe el estado en un archivo temporal y lo reemplaza de una vez, para
+    que un corte a mitad de escritura no deje el estado anterior corrupto.
+    """
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(estado, f, separators=(",", ":"))
+    os.replace(temporal, ruta)
+
+def pivotes_confirmados(valores, comparador, orden=5):
+    """
+    Extremos de argrelextrema que ya tienen 'orden' ruedas a cada lado. En las
+    últimas ruedas argrelextrema compara contra menos vecinos (modo clip) y
+    marca como extremo cualquier cierre que sea el mayor o menor del tramo
+    final; esos se descartan para que una tendencia no genere un
+    NUEVO_MAXIMO/MINIMO_LOCAL en cada corrida.
+    """
+    indices = argrelextrema(valores, comparador, order=orden)[0]
+    return indices[indices < len(valores) - orden]
+
+def estado_actual(simbolo):
+    """
+    Descarga el símbolo y devuelve su estado como lista en el orden de CAMPOS_ESTADO,
+    o None si no hay datos.
+    """
+    data = yf.download(simbolo, period="2y", interval="1d", progress=False)
+    if data.empty:
+        return None
+
+    precios = pd.Series(data["Close"].to_numpy().ravel(), index=data.index)
+    rsi = float(calcular_rsi(precios).iloc[-1])
+    rsi = None if np.isnan(rsi) else round(rsi, 2)
+
+    maxima_idx = pivotes_confirmados(precios.values, np.greater_equal)
+    minima_idx = pivotes_confirmados(precios.values, np.less_equal)
+    ultimo_max = precios.index[maxima_idx[-1]].strftime("%Y-%m-%d") if len(maxima_idx) else None
+    ultimo_min = precios.index[minima_idx[-1]].strftime("%Y-%m-%d") if len(minima_idx) else None
+
+    return [
+        rsi,
+        generar_senal(rsi) if rsi is not None else None,
+        ultimo_max,
+        ultimo_min,
+        round(float(precios.max()), 2),
+        round(float(precios.min()), 2),
+    ]
+
+# === DETECCION DE CAMBIOS ===
+def detectar_cambios(simbolo, anterior, actual):
+    """
+    Compara dos estados y devuelve la lista de filas de cambios.
+    """
+    if anterior is None:
+        return [{"Simbolo": simbolo, "Tipo": "NUEVO_SIMBOLO", "Anterior": None, "Actual": actual[1]}]
+
+    previo = dict(zip(CAMPOS_ESTADO, anterior))
+    nuevo = dict(zip(CAMPOS_ESTADO, actual))
+    cambios = []
+
+    def agregar(tipo, valor_anterior, valor_actual):
+        cambios.append({"Simbolo": simbolo, "Tipo": tipo, "Anterior": valor_anterior, "Actual": valor_actual})
+
+    if previo["senal"] != nuevo["senal"]:
+        agregar("CAMBIO_SENAL", previo["senal"], nuevo["senal"])
+
+    if previo["rsi"] is not None and nuevo["rsi"] is not None:
+        for umbral in UMBRALES_RSI:
+            if (previo["rsi"] < umbral) != (nuevo["rsi"] < umbral):
+                agregar(f"CRUCE_RSI_{umbral}", previo["rsi"], nuevo["rsi"])
+
+    # Las fechas van en formato ISO, así que se comparan como texto
+    if nuevo["ultimo_max_local"] and (previo["ultimo_max_local"] or "") < nuevo["ultimo_max_local"]:
+        agregar("NUEVO_MAXIMO_LOCAL", previo["ultimo_max_local"], nuevo["ultimo_max_local"])
+    if nuevo["ultimo_min_local"] and (previo["ultimo_min_local"] or "") < nuevo["ultimo_min_local"]:
+        agregar("NUEVO_MINIMO_LOCAL", previo["ultimo_min_local"], nuevo["ultimo_min_local"])
+
+    if nuevo["max_serie"] > previo["max_serie"]:
+        agregar("NUEVO_MAXIMO_SERIE", previo["max_serie"], nuevo["max_serie"])
+    if nuevo["min_serie"] < previo["min_serie"]:
+        agregar("NUEVO_MINIMO_SERIE", previo["min_serie"], nuevo["min_serie"])
+
+    return cambios
+
+# Leer símbolos desde el archivo
+try:
+    with open("simbolos.txt", "r") as f:
+        simbolos = [line.strip().upper() for line in f if line.strip()]
+except FileNotFoundError:
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    sys.exit(1)
+
+estado = leer_estado(ARCHIVO_ESTADO)
+cambios = []
+
+for simbolo in simbolos:
+    print(f"Procesando {simbolo}...")
+    try:
+        actual = estado_actual(simbolo)
+    except Exception as e:
+        # Se conserva el estado anterior para comparar en la próxima corrida
+        print(f"  ✗ Error procesando {simbolo}: {str(e)}")
+        continue
+    if actual is None:
+        print(f"  ⚠ No se encontraron datos para {simbolo}")
+        continue
+
+    cambios_simbolo = detectar_cambios(simbolo, estado.get(simbolo), actual)
+    for cambio in cambios_simbolo:
+        print(f"  → {cambio['Tipo']}: {cambio['Anterior']} → {cambio['Actual']}")
+    cambios.extend(cambios_simbolo)
+    estado[simbolo] = actual
+
+guardar_estado(ARCHIVO_ESTADO, estado)
+
+# === GUARDAR CAMBIOS ===
+df_cambios = pd.DataFrame(cambios, columns=["Simbolo", "Tipo", "Anterior", "Actual"])
+df_cambios.to_csv(ARCHIVO_CAMBIOS, index=False, sep=";")
+print(f"\n✓ Archivo '{ARCHIVO_CAMBIOS}' generado correctamente ({len(cambios)} cambios)")
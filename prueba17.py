@@ -0,0 +1,205 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.signal import argrelextrema
+import argparse
+import os
+import sys
+
+# Soportes y resistencias a partir de los máximos y mínimos parciales.
+#
+# Los pivotes confirmados de argrelextrema(order=5) se agrupan en niveles de
+# precio: se ordenan por precio y cada nivel toma los pivotes que quedan
+# dentro de la tolerancia por encima del primero. Cada nivel pesa más cuantas más
+# veces fue tocado y cuanto más reciente fue cada toque.
+#
+# Uso:
+#   python prueba17.py [--tolerancia 1.5] [--semivida 120] [--min-toques 2]
+#
+# Salidas:
+#   niveles.csv  -> todos los niveles de cada símbolo
+#   desvio.csv   -> desvíos de prueba09 más la distancia al soporte y la
+#                   resistencia más cercanos
+
+# === AGRUPAMIENTO DE PIVOTES ===
+def pivotes_confirmados(valores, comparador, orden=5):
+    """
+    Extremos de argrelextrema con 'orden' ruedas a cada lado. En los bordes
+    argrelextrema compara contra menos vecinos (modo clip) y la última rueda
+    suele salir como pivote: sumaría un toque reciente, de peso ~1, justo en
+    el último cierre y acercaría el soporte o la resistencia a distancia 0.
+    """
+    indices = argrelextrema(valores, comparador, order=orden)[0]
+    return indices[(indices >= orden) & (indices < len(valores) - orden)]
+
+def agrupar_niveles(precios, posiciones, largo_serie, tolerancia=0.015, semivida=120):
+    """
+    Agrupa pivotes en niveles con una sola pasada sobre los precios ordenados.
+
+    precios, posiciones : precio y posición en la serie de cada pivote
+    tolerancia          : ancho relativo máximo de cada nivel
+    semivida            : ruedas en que el peso de un toque se reduce a la mitad
+
+    Devuelve un DataFrame con Nivel (promedio ponderado), Banda_Inf, Banda_Sup,
+    Toques, Fuerza (suma de pesos) y Ultimo_Toque (posición del toque más reciente).
+    """
+    if len(precios) == 0:
+        # Mismos tipos que con pivotes, así Ultimo_Toque sigue sirviendo de índice
+        vacio = np.empty(0)
+        return pd.DataFrame({"Nivel": vacio, "Banda_Inf": vacio, "Banda_Sup": vacio,
+                             "Toques": np.empty(0, dtype=np.int64), "Fuerza": vacio,
+                             "Ultimo_Toque": np.empty(0, dtype=np.intp)})
+
+    orden = np.argsort(precios, kind="stable")
+    p = precios[orden]
+    pos = posiciones[orden]
+    peso = 0.5 ** ((largo_serie - 1 - pos) / semivida)
+
+    # Cada nivel arranca en el pivote más bajo todavía sin asignar y abarca
+    # hasta 'tolerancia' por encima de él; searchsorted encuentra el corte sin
+    # recorrer los pivotes uno por uno, así las bandas no se encadenan
+    inicios = []
+    inicio = 0
+    while inicio < len(p):
+        inicios.append(inicio)
+        inicio = np.searchsorted(p, p[inicio] * (1 + tolerancia), side="right")
+    inicios = np.asarray(inicios)
+
+    fuerza = np.add.reduceat(peso, inicios)
+    return pd.DataFrame({
+        "Nivel": np.add.reduceat(p * peso, inicios) / fuerza,
+        "Banda_Inf": p[inicios],
+        "Banda_Sup": np.maximum.reduceat(p, inicios),
+        "Toques": np.diff(np.append(inicios, len(p))),
+        "Fuerza": fuerza,
+        "Ultimo_Toque": np.maximum.reduceat(pos, inicios),
+    })
+
+def niveles_cercanos(niveles, ultima, min_toques=2):
+    """
+    Devuelve (soporte, resistencia): el nivel más alto por debajo del último
+    precio y el más bajo por encima, entre los que tienen al menos 'min_toques'.
+    """
+    validos = niveles[niveles["Toques"] >= min_toques]
+    debajo = validos.loc[validos["Nivel"] < ultima, "Nivel"]
+    encima = validos.loc[validos["Nivel"] >= ultima, "Nivel"]
+    soporte = float(debajo.max()) if len(debajo) else np.nan
+    resistencia = float(encima.min()) if len(encima) else np.nan
+    return soporte, resistencia
+
+# === GRAFICO ===
+def graficar(simbolo, precios, niveles, ultima, min_toques):
+    fig, ax = plt.subplots(figsize=(12, 7))
+    ax.plot(precios.index, precios.values, label="Precio de Cierre", color="blue", linewidth=1.5)
+
+    fuerza_max = niveles["Fuerza"].max() if len(niveles) else 1.0
+    for _, nivel in niveles[niveles["Toques"] >= min_toques].iterrows():
+        color = "green" if nivel["Nivel"] < ultima else "red"
+        alpha = 0.15 + 0.45 * nivel["Fuerza"] / fuerza_max
+        ax.axhspan(nivel["Banda_Inf"], nivel["Banda_Sup"], color=color, alpha=alpha)
+        ax.axhline(y=nivel["Nivel"], color=color, linestyle=":", linewidth=1, alpha=alpha)
+
+    ax.axhline(y=ultima, color="gray", linestyle="--",
+               linewidth=1, alpha=0.7, label=f"Último precio: ${ultima:.2f}")
+    ax.set_title(f"{simbolo} - Soportes (verde) y resistencias (rojo)", fontsize=14, fontweight='bold')
+    ax.set_xlabel("Fecha", fontsize=11)
+    ax.set_ylabel("Precio de Cierre (USD)", fontsize=11)
+    ax.legend(loc='best', fontsize=9)
+    ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+    ruta_img = os.path.join("graficos", f"{simbolo}_niveles.png")
+    plt.savefig(ruta_img, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    print(f"  ✓ Gráfico guardado: {ruta_img}")
+
+# === ARGUMENTOS ===
+parser = argparse.ArgumentParser(description="Soportes y resistencias por agrupamiento de extremos")
+parser.add_argument("--tolerancia", type=float, default=1.5,
+                    help="ancho máximo en %% de cada nivel (por defecto 1.5)")
+parser.add_argument("--semivida", type=float, default=120,
+                    help="ruedas en que el peso de un toque se reduce a la mitad (por defecto 120)")
+parser.add_argument("--min-toques", type=int, default=2,
+                    help="toques mínimos para considerar un nivel (por defecto 2)")
+args = parser.parse_args()
+
+# Crear carpeta para guardar gráficos
+os.makedirs("graficos", exist_ok=True)
+
+# Leer símbolos desde el archivo
+try:
+    with open("simbolos.txt", "r") as f:
+        simbolos = [line.strip().upper() for line in f if line.strip()]
+except FileNotFoundError:
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    sys.exit(1)
+
+resultados_desvio = []
+tablas_niveles = []
+
+for simbolo in simbolos:
+    print(f"Procesando {simbolo}...")
+
+    try:
+        data = yf.download(simbolo, period="2y", interval="1d", progress=False)
+
+        if data.empty:
+            print(f"  ⚠ No se encontraron datos para {simbolo}")
+            continue
+
+        precios = pd.Series(data["Close"].to_numpy().ravel(), index=data.index)
+
+        # Pivotes: máximos y mínimos parciales juntos, ambos son toques de un nivel
+        maxima_idx = pivotes_confirmados(precios.values, np.greater_equal)
+        minima_idx = pivotes_confirmados(precios.values, np.less_equal)
+        pivotes = np.unique(np.concatenate((maxima_idx, minima_idx)))
+
+        niveles = agrupar_niveles(precios.values[pivotes], pivotes, len(precios),
+                                  tolerancia=args.tolerancia / 100, semivida=args.semivida)
+
+        # Obtener máximos y mínimos globales
+        max_global = float(precios.max())
+        min_global = float(precios.min())
+        ultima = float(precios.iloc[-1])
+
+        # Calcular desvíos porcentuales
+        desvio_max = ((ultima - max_global) / max_global) * 100
+        desvio_min = ((ultima - min_global) / min_global) * 100
+
+        soporte, resistencia = niveles_cercanos(niveles, ultima, args.min_toques)
+
+        resultados_desvio.append({
+            "Simbolo": simbolo,
+            "Ultimo_Cierre": round(ultima, 2),
+            "Maximo_Serie": round(max_global, 2),
+            "Minimo_Serie": round(min_global, 2),
+            "Desvio_Max(%)": round(desvio_max, 2),
+            "Desvio_Min(%)": round(desvio_min, 2),
+            "Soporte": round(soporte, 2),
+            "Dist_Soporte(%)": round((ultima - soporte) / ultima * 100, 2),
+            "Resistencia": round(resistencia, 2),
+            "Dist_Resistencia(%)": round((resistencia - ultima) / ultima * 100, 2)
+        })
+
+        niveles.insert(0, "Simbolo", simbolo)
+        niveles.insert(1, "Tipo", np.where(niveles["Nivel"] < ultima, "SOPORTE", "RESISTENCIA"))
+        niveles["Ultimo_Toque"] = precios.index[niveles["Ultimo_Toque"].to_numpy()].strftime("%Y-%m-%d")
+        tablas_niveles.append(niveles)
+
+        graficar(simbolo, precios, niveles, ultima, args.min_toques)
+
+    except Exception as e:
+        print(f"  ✗ Error procesando {simbolo}: {str(e)}")
+        continue
+
+# === GUARDAR ARCHIVOS CSV ===
+if tablas_niveles:
+    df_niveles = pd.concat(tablas_niveles, ignore_index=True).round(
+        {"Nivel": 2, "Banda_Inf": 2, "Banda_Sup": 2, "Fuerza": 3})
+    df_niveles.to_csv("niveles.csv", index=False, sep=";")
+    print(f"\n✓ Archivo 'niveles.csv' generado correctamente ({len(df_niveles)} niveles)")
+
+df_desvio = pd.DataFrame(resultados_desvio)
+df_desvio.to_csv("desvio.csv", index=False, sep=";")
+print(f"✓ Archivo 'desvio.csv' generado correctamente ({len(resultados_desvio)} registros)")
@@ -0,0 +1,167 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+from scipy.signal import argrelextrema
+import argparse
+import sys
+
+# Divergencias entre precio y RSI para todo el universo a la vez.
+#
+# Se descarga el panel de cierres (fechas x símbolos), se suben las ruedas con
+# dato de cada columna al principio (así cada símbolo se mide en sus propias
+# ruedas, sin los huecos del calendario unido), se calcula el RSI de todas las
+# columnas juntas y se buscan los pivotes con argrelextrema sobre el eje de
+# fechas. Luego se comparan pivotes consecutivos del mismo símbolo:
+#   BAJISTA: el precio hace un máximo más alto y el RSI un máximo más bajo
+#   ALCISTA: el precio hace un mínimo más bajo y el RSI un mínimo más alto
+#
+# Uso:
+#   python prueba18.py [--orden 5] [--max-separacion 60]
+#
+# Salida: divergencias.csv (una fila por evento)
+
+# === FUNCION PARA CALCULAR RSI MANUALMENTE ===
+def calcular_rsi(series, periodo=14):
+    delta = series.diff()
+    ganancia = delta.where(delta > 0, 0)
+    perdida = -delta.where(delta < 0, 0)
+
+    media_gan = ganancia.rolling(window=periodo).mean()
+    media_per = perdida.rolling(window=periodo).mean()
+
+    rs = media_gan / media_per
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+# === PANEL COMPACTO ===
+def compactar_panel(valores):
+    """
+    Sube las filas con dato de cada columna al principio, en su orden, y deja
+    los NaN al final. Devuelve (compacto, filas_originales, largos): la fila
+    del panel original de cada posición y la cantidad de ruedas con dato de
+    cada columna. En el panel compacto un hueco del calendario unido no corta
+    una ventana ni cuenta como rueda.
+    """
+    filas_originales = np.argsort(np.isnan(valores), axis=0, kind="stable")
+    compacto = np.take_along_axis(valores, filas_originales, axis=0)
+    largos = (~np.isnan(valores)).sum(axis=0)
+    return compacto, filas_originales, largos
+
+# === DETECCION DE DIVERGENCIAS ===
+def pares_de_pivotes(precios, rsi, largos, comparador, orden, max_separacion):
+    """
+    Busca los pivotes de todas las columnas del panel compacto y devuelve,
+    para cada par de pivotes consecutivos del mismo símbolo, los arreglos
+    (columna, fila_1, fila_2, precio_1, precio_2, rsi_1, rsi_2).
+    """
+    filas, columnas = argrelextrema(precios, comparador, axis=0, order=orden)
+
+    # En las últimas 'orden' ruedas de cada símbolo argrelextrema compara
+    # contra menos vecinos (modo clip) y marca pivotes que todavía pueden
+    # desaparecer: se descartan
+    confirmados = filas < largos[columnas] - orden
+    filas = filas[confirmados]
+    columnas = columnas[confirmados]
+
+    # Ordenar por símbolo y luego por fecha para que los consecutivos queden juntos
+    orden_pivotes = np.lexsort((filas, columnas))
+    filas = filas[orden_pivotes]
+    columnas = columnas[orden_pivotes]
+
+    # Con greater_equal / less_equal una meseta marca varios pivotes seguidos:
+    # se queda solo el primero de cada tramo
+    nuevo = np.ones(len(filas), dtype=bool)
+    nuevo[1:] = (columnas[1:] != columnas[:-1]) | (filas[1:] - filas[:-1] > orden)
+    filas = filas[nuevo]
+    columnas = columnas[nuevo]
+
+    mismo = (columnas[1:] == columnas[:-1]) & (filas[1:] - filas[:-1] <= max_separacion)
+    col = columnas[1:][mismo]
+    f1 = filas[:-1][mismo]
+    f2 = filas[1:][mismo]
+    return col, f1, f2, precios[f1, col], precios[f2, col], rsi[f1, col], rsi[f2, col]
+
+def detectar_divergencias(precios, rsi, largos, orden=5, max_separacion=60):
+    """
+    precios, rsi : paneles compactos (ruedas x símbolos), NaN solo al final.
+    largos       : ruedas con dato de cada símbolo.
+    Devuelve un diccionario de arreglos con todos los eventos encontrados;
+    las filas son posiciones en el panel compacto.
+    """
+    eventos = []
+
+    col, f1, f2, p1, p2, r1, r2 = pares_de_pivotes(precios, rsi, largos, np.greater_equal, orden, max_separacion)
+    bajista = (p2 > p1) & (r2 < r1)
+    eventos.append((np.full(bajista.sum(), "BAJISTA"), col[bajista], f1[bajista], f2[bajista],
+                    p1[bajista], p2[bajista], r1[bajista], r2[bajista]))
+
+    col, f1, f2, p1, p2, r1, r2 = pares_de_pivotes(precios, rsi, largos, np.less_equal, orden, max_separacion)
+    alcista = (p2 < p1) & (r2 > r1)
+    eventos.append((np.full(alcista.sum(), "ALCISTA"), col[alcista], f1[alcista], f2[alcista],
+                    p1[alcista], p2[alcista], r1[alcista], r2[alcista]))
+
+    nombres = ("tipo", "columna", "fila_1", "fila_2", "precio_1", "precio_2", "rsi_1", "rsi_2")
+    return {nombre: np.concatenate(partes) for nombre, partes in zip(nombres, zip(*eventos))}
+
+# === ARGUMENTOS ===
+parser = argparse.ArgumentParser(description="Divergencias precio/RSI en todo el universo")
+parser.add_argument("--orden", type=int, default=5, help="ventana de argrelextrema (por defecto 5)")
+parser.add_argument("--max-separacion", type=int, default=60,
+                    help="ruedas máximas entre los dos pivotes comparados (por defecto 60)")
+args = parser.parse_args()
+
+# Leer símbolos desde el archivo
+try:
+    with open("simbolos.txt", "r") as f:
+        simbolos = [line.strip().upper() for line in f if line.strip()]
+except FileNotFoundError:
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    sys.exit(1)
+
+# === PANEL DE CIERRES ===
+print(f"Descargando cierres de {len(simbolos)} símbolos...")
+data = yf.download(simbolos, period="2y", interval="1d", progress=False)
+if data.empty:
+    print("⚠ No se encontraron datos")
+    sys.exit(1)
+
+cierres = data["Close"]
+if isinstance(cierres, pd.Series):
+    cierres = cierres.to_frame(simbolos[0])
+cierres = cierres.dropna(axis=1, how="all")
+del data
+
+# Un día sin dato de un símbolo (feriado local, suspensión) no debe contar
+# como rueda: RSI, pivotes, 'orden' y 'max_separacion' se miden en el panel compacto
+precios, filas_originales, largos = compactar_panel(cierres.to_numpy(dtype=np.float64))
+rsi = calcular_rsi(pd.DataFrame(precios)).to_numpy()
+
+eventos = detectar_divergencias(precios, rsi, largos, orden=args.orden, max_separacion=args.max_separacion)
+
+# Un pivote sin RSI (inicio de la serie) no puede formar divergencia
+validos = ~np.isnan(eventos["rsi_1"]) & ~np.isnan(eventos["rsi_2"])
+eventos = {nombre: valores[validos] for nombre, valores in eventos.items()}
+
+# Volver de posiciones del panel compacto a filas del calendario unido
+for fila in ("fila_1", "fila_2"):
+    eventos[fila] = filas_originales[eventos[fila], eventos["columna"]]
+
+fechas = cierres.index.strftime("%Y-%m-%d").to_numpy()
+nombres = cierres.columns.astype(str).to_numpy()
+
+df_divergencias = pd.DataFrame({
+    "Simbolo": nombres[eventos["columna"]],
+    "Tipo": eventos["tipo"],
+    "Fecha_Pivote_1": fechas[eventos["fila_1"]],
+    "Fecha_Pivote_2": fechas[eventos["fila_2"]],
+    "Precio_1": np.round(eventos["precio_1"], 2),
+    "Precio_2": np.round(eventos["precio_2"], 2),
+    "RSI_1": np.round(eventos["rsi_1"], 2),
+    "RSI_2": np.round(eventos["rsi_2"], 2),
+}).sort_values(["Simbolo", "Fecha_Pivote_2"], kind="stable")
+
+df_divergencias.to_csv("divergencias.csv", index=False, sep=";")
+print(f"✓ Archivo 'divergencias.csv' generado correctamente ({len(df_divergencias)} eventos)")
+for simbolo, grupo in df_divergencias.groupby("Simbolo", sort=False):
+    ultimo = grupo.iloc[-1]
+    print(f"  {simbolo}: {len(grupo)} divergencias, última {ultimo['Tipo']} el {ultimo['Fecha_Pivote_2']}")
@@ -0,0 +1,189 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+import argparse
+import sys
+
+# Biblioteca de indicadores calculados en conjunto sobre High/Low/Close/Volume.
+#
+# En lugar de una pasada de rolling/ewm de pandas por indicador, todos se
+# arman con operaciones de numpy sobre los mismos arreglos y comparten los
+# intermedios: la diferencia de cierres (RSI y OBV), las sumas acumuladas de
+# cierre y cierre² (Bollinger), el cierre anterior (ATR) y las ventanas de
+# máximos y mínimos (estocástico). Cada intermedio se calcula una sola vez
+# y solo si algún indicador elegido lo necesita.
+#
+# Uso:
+#   python prueba19.py [--indicadores rsi,macd,bollinger,atr,estocastico,obv]
+#
+# Salida: indicadores.csv con el último valor de cada indicador por símbolo.
+
+INDICADORES = ("rsi", "macd", "bollinger", "atr", "estocastico", "obv")
+
+# === MEDIAS SOBRE ARREGLOS ===
+def suma_movil(acumulado, ventana):
+    """
+    Suma móvil a partir de una suma acumulada con un cero adelante.
+    Las primeras ventana-1 posiciones quedan en NaN.
+    """
+    resultado = np.full(len(acumulado) - 1, np.nan)
+    resultado[ventana - 1:] = acumulado[ventana:] - acumulado[:-ventana]
+    return resultado
+
+def media_exponencial(valores, alpha):
+    """
+    Media exponencial recursiva en una sola pasada (equivale a ewm(adjust=False)).
+    """
+    return lfilter([alpha], [1, alpha - 1], valores, zi=[(1 - alpha) * valores[0]])[0]
+
+# === INTERMEDIOS COMPARTIDOS ===
+class Intermedios:
+    """
+    Calcula cada intermedio la primera vez que se pide y lo reutiliza después.
+    """
+    __slots__ = ("high", "low", "close", "volume", "_cache")
+
+    def __init__(self, high, low, close, volume):
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self._cache = {}
+
+    def _obtener(self, clave, calcular):
+        if clave not in self._cache:
+            self._cache[clave] = calcular()
+        return self._cache[clave]
+
+    def diferencia(self):
+        return self._obtener("diferencia", lambda: np.diff(self.close, prepend=np.nan))
+
+    def cierre_anterior(self):
+        return self._obtener("cierre_anterior", lambda: np.concatenate(([np.nan], self.close[:-1])))
+
+    def acumulado(self, nombre, calcular_valores):
+        return self._obtener(("acumulado", nombre),
+                             lambda: np.concatenate(([0.0], np.cumsum(calcular_valores()))))
+
+    def ventanas(self, nombre, valores, ventana):
+        return self._obtener(("ventanas", nombre, ventana),
+                             lambda: sliding_window_view(valores, ventana))
+
+# === INDICADORES ===
+def calcular_indicadores(high, low, close, volume, seleccion=INDICADORES):
+    """
+    Calcula los indicadores pedidos en 'seleccion' y devuelve un diccionario
+    {columna: arreglo}. Todos los arreglos tienen el largo de la serie.
+    """
+    desconocidos = set(seleccion) - set(INDICADORES)
+    if desconocidos:
+        raise ValueError(f"Indicadores desconocidos: {', '.join(sorted(desconocidos))}")
+
+    high, low, close, volume = (np.asarray(x, dtype=np.float64).ravel() for x in (high, low, close, volume))
+    inter = Intermedios(high, low, close, volume)
+    resultado = {}
+    n = len(close)
+
+    if "rsi" in seleccion and n >= 14:
+        # Medias simples de ganancias y pérdidas, igual que calcular_rsi de prueba09
+        # (la primera diferencia, que no existe, cuenta como 0)
+        delta = inter.diferencia()
+        with np.errstate(invalid="ignore"):
+            ganancia = np.where(delta > 0, delta, 0.0)
+            perdida = np.where(delta < 0, -delta, 0.0)
+        suma_gan = suma_movil(np.concatenate(([0.0], np.cumsum(ganancia))), 14)
+        suma_per = suma_movil(np.concatenate(([0.0], np.cumsum(perdida))), 14)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            resultado["RSI_14"] = 100 - (100 / (1 + suma_gan / suma_per))
+
+    if "macd" in seleccion:
+        macd = media_exponencial(close, 2 / 13) - media_exponencial(close, 2 / 27)
+        senal = media_exponencial(macd, 2 / 10)
+        resultado["MACD"] = macd
+        resultado["MACD_Senal"] = senal
+        resultado["MACD_Hist"] = macd - senal
+
+    if "bollinger" in seleccion and n >= 20:
+        suma = suma_movil(inter.acumulado("close", lambda: close), 20)
+        suma_cuad = suma_movil(inter.acumulado("close2", lambda: close * close), 20)
+        media = suma / 20
+        # Desvío poblacional, como en la definición original de las bandas
+        desvio = np.sqrt(np.maximum(suma_cuad / 20 - media * media, 0.0))
+        resultado["BB_Media"] = media
+        resultado["BB_Sup"] = media + 2 * desvio
+        resultado["BB_Inf"] = media - 2 * desvio
+
+    if "atr" in seleccion and n >= 14:
+        anterior = inter.cierre_anterior()
+        rango = np.fmax(high - low, np.fmax(np.abs(high - anterior), np.abs(low - anterior)))
+        atr = media_exponencial(rango, 1 / 14)
+        atr[:13] = np.nan
+        resultado["ATR_14"] = atr
+
+    if "estocastico" in seleccion and n >= 16:
+        maximos = inter.ventanas("high", high, 14).max(axis=1)
+        minimos = inter.ventanas("low", low, 14).min(axis=1)
+        k = np.full(n, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k[13:] = (close[13:] - minimos) / (maximos - minimos) * 100
+        acumulado_k = np.concatenate(([0.0], np.cumsum(k[13:])))
+        d = np.full(n, np.nan)
+        d[13:] = suma_movil(acumulado_k, 3) / 3
+        resultado["Estocastico_K"] = k
+        resultado["Estocastico_D"] = d
+
+    if "obv" in seleccion:
+        direccion = np.sign(np.nan_to_num(inter.diferencia()))
+        resultado["OBV"] = np.cumsum(direccion * volume)
+
+    return resultado
+
+# === ARGUMENTOS ===
+parser = argparse.ArgumentParser(description="Indicadores técnicos calculados en conjunto")
+parser.add_argument("--indicadores", default=",".join(INDICADORES),
+                    help=f"lista separada por comas (por defecto {','.join(INDICADORES)})")
+args = parser.parse_args()
+
+seleccion = tuple(i.strip().lower() for i in args.indicadores.split(",") if i.strip())
+if set(seleccion) - set(INDICADORES):
+    print(f"Error: indicadores válidos: {', '.join(INDICADORES)}")
+    sys.exit(1)
+
+# Leer símbolos desde el archivo
+try:
+    with open("simbolos.txt", "r") as f:
+        simbolos = [line.strip().upper() for line in f if line.strip()]
+except FileNotFoundError:
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    sys.exit(1)
+
+resultados = []
+
+for simbolo in simbolos:
+    print(f"Procesando {simbolo}...")
+
+    try:
+        data = yf.download(simbolo, period="2y", interval="1d", progress=False)
+
+        if data.empty:
+            print(f"  ⚠ No se encontraron datos para {simbolo}")
+            continue
+
+        indicadores = calcular_indicadores(data["High"], data["Low"], data["Close"], data["Volume"], seleccion)
+
+        fila = {"Simbolo": simbolo}
+        for columna, valores in indicadores.items():
+            ultimo = float(valores[-1])
+            fila[columna] = round(ultimo, 2) if not np.isnan(ultimo) else np.nan
+        resultados.append(fila)
+
+    except Exception as e:
+        print(f"  ✗ Error procesando {simbolo}: {str(e)}")
+        continue
+
+# === GUARDAR RESULTADOS ===
+df_indicadores = pd.DataFrame(resultados)
+df_indicadores.to_csv("indicadores.csv", index=False, sep=";")
+print(f"\n✓ Archivo 'indicadores.csv' generado correctamente ({len(resultados)} registros)")
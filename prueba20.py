@@ -0,0 +1,236 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import argrelextrema
+import argparse
+import json
+import os
+import sys
+
+# Matriz de features para los modelos de inteligencia artificial.
+#
+# A partir del panel de cierres (fechas x símbolos) se arman, para todas las
+# columnas a la vez, los indicadores que ya usan las pruebas anteriores (RSI,
+# distancia a las medias, desvíos respecto al máximo y mínimo, distancia a
+# los últimos extremos locales). Las muestras son ventanas de las últimas L
+# ruedas de cada símbolo, tomadas como vistas (sliding_window_view) sin copiar
+# fila por fila, y la etiqueta es el retorno de las H ruedas siguientes.
+#
+# Uso:
+#   python prueba20.py [--periodo 5y] [--ventana 20] [--horizonte 5] [--pliegues 5]
+#
+# Salidas en la carpeta 'dataset/' (todas se pueden abrir con np.load(..., mmap_mode="r")):
+#   X.npy        muestras x ventana x features (float32)
+#   y.npy        retorno futuro de cada muestra (float32)
+#   fechas.npy   última fecha de la ventana de cada muestra (datetime64[D])
+#   simbolo.npy  posición del símbolo de cada muestra en meta.json (int32)
+#   meta.json    nombres de features y símbolos, parámetros y pliegues walk-forward
+
+CARPETA_SALIDA = "dataset"
+FEATURES = ("Retorno_1d", "RSI", "Dist_MA50", "Dist_MA200", "Desvio_Max", "Desvio_Min",
+            "Dist_Max_Local", "Dist_Min_Local", "Volatilidad_20")
+
+# === FUNCION PARA CALCULAR RSI MANUALMENTE ===
+def calcular_rsi(series, periodo=14):
+    delta = series.diff()
+    ganancia = delta.where(delta > 0, 0)
+    perdida = -delta.where(delta < 0, 0)
+
+    media_gan = ganancia.rolling(window=periodo).mean()
+    media_per = perdida.rolling(window=periodo).mean()
+
+    rs = media_gan / media_per
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+# === PANEL COMPACTO ===
+def compactar_panel(valores):
+    """
+    Sube las filas con dato de cada columna al principio, en su orden, y deja
+    los NaN al final. Devuelve (compacto, filas_originales): en el panel
+    compacto cada símbolo se mide en sus propias ruedas y un hueco del
+    calendario unido no corta las ventanas móviles.
+    """
+    filas_originales = np.argsort(np.isnan(valores), axis=0, kind="stable")
+    return np.take_along_axis(valores, filas_originales, axis=0), filas_originales
+
+def descompactar(compacto, filas_originales):
+    """
+    Devuelve cada valor del panel compacto a su fila del calendario unido.
+    Acepta dimensiones extra después de (fechas, símbolos).
+    """
+    indices = filas_originales.reshape(filas_originales.shape + (1,) * (compacto.ndim - 2))
+    resultado = np.empty_like(compacto)
+    np.put_along_axis(resultado, np.broadcast_to(indices, compacto.shape), compacto, axis=0)
+    return resultado
+
+# === FEATURES DEL PANEL ===
+def ultimo_extremo_conocido(cierres, comparador, orden=5):
+    """
+    Precio del último extremo local ya confirmado en cada fecha. Un extremo de
+    argrelextrema(order=5) recién se conoce 'orden' ruedas después, así que se
+    ubica en esa fecha y se arrastra hacia adelante: no hay mirada al futuro.
+    """
+    valores = cierres.to_numpy()
+    filas, columnas = argrelextrema(valores, comparador, axis=0, order=orden)
+    conocido = filas + orden
+    dentro = conocido < len(valores)
+    extremos = np.full(valores.shape, np.nan)
+    extremos[conocido[dentro], columnas[dentro]] = valores[filas[dentro], columnas[dentro]]
+    return pd.DataFrame(extremos, index=cierres.index, columns=cierres.columns).ffill()
+
+def armar_features(cierres):
+    """
+    Devuelve un arreglo float32 (fechas x símbolos x features) en el orden de FEATURES.
+    Todas las ventanas miran solo hacia atrás. Se espera el panel compacto.
+    """
+    retornos = np.log(cierres / cierres.shift(1))
+    maximo = cierres.rolling(window=504, min_periods=1).max()
+    minimo = cierres.rolling(window=504, min_periods=1).min()
+
+    columnas = [
+        retornos,
+        calcular_rsi(cierres) / 100,
+        cierres / cierres.rolling(window=50).mean() - 1,
+        cierres / cierres.rolling(window=200).mean() - 1,
+        cierres / maximo - 1,
+        cierres / minimo - 1,
+        cierres / ultimo_extremo_conocido(cierres, np.greater_equal) - 1,
+        cierres / ultimo_extremo_conocido(cierres, np.less_equal) - 1,
+        retornos.rolling(window=20).std(),
+    ]
+    return np.stack([c.to_numpy(dtype=np.float32) for c in columnas], axis=-1)
+
+# === PLIEGUES WALK-FORWARD ===
+def pliegues_walk_forward(fechas_muestras, n_pliegues, separacion):
+    """
+    Divide las fechas en n_pliegues+1 tramos. El pliegue i entrena con todo lo
+    anterior al tramo i+1 y prueba en ese tramo; entre ambos se dejan
+    'separacion' fechas para que las etiquetas de entrenamiento no se solapen
+    con el período de prueba. Devuelve rangos [inicio, fin) sobre las muestras.
+    """
+    fechas_unicas = np.unique(fechas_muestras)
+    cortes = np.linspace(0, len(fechas_unicas), n_pliegues + 2).astype(int)
+    pliegues = []
+    for i in range(1, n_pliegues + 1):
+        fin_entrenamiento = max(cortes[i] - separacion, 0)
+        if fin_entrenamiento == 0 or cortes[i] >= cortes[i + 1]:
+            continue
+        # Las muestras están ordenadas por fecha: cada límite es un searchsorted
+        entrenamiento = (0, int(np.searchsorted(fechas_muestras, fechas_unicas[fin_entrenamiento - 1], side="right")))
+        prueba = (int(np.searchsorted(fechas_muestras, fechas_unicas[cortes[i]], side="left")),
+                  int(np.searchsorted(fechas_muestras, fechas_unicas[cortes[i + 1] - 1], side="right")))
+        pliegues.append({
+            "entrenamiento": entrenamiento,
+            "prueba": prueba,
+            "fechas_prueba": [str(fechas_unicas[cortes[i]]), str(fechas_unicas[cortes[i + 1] - 1])],
+        })
+    return pliegues
+
+# === ARGUMENTOS ===
+parser = argparse.ArgumentParser(description="Matriz de features y etiquetas para modelos")
+parser.add_argument("--periodo", default="5y", help="historia a descargar (por defecto 5y)")
+parser.add_argument("--ventana", type=int, default=20, help="ruedas por muestra (por defecto 20)")
+parser.add_argument("--horizonte", type=int, default=5, help="ruedas del retorno a predecir (por defecto 5)")
+parser.add_argument("--pliegues", type=int, default=5, help="pliegues walk-forward (por defecto 5)")
+parser.add_argument("--bloque", type=int, default=256, help="fechas copiadas a disco por vez (por defecto 256)")
+args = parser.parse_args()
+
+# Leer símbolos desde el archivo
+try:
+    with open("simbolos.txt", "r") as f:
+        simbolos = [line.strip().upper() for line in f if line.strip()]
+except FileNotFoundError:
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    sys.exit(1)
+
+os.makedirs(CARPETA_SALIDA, exist_ok=True)
+
+# === PANEL DE CIERRES ===
+print(f"Descargando cierres de {len(simbolos)} símbolos...")
+data = yf.download(simbolos, period=args.periodo, interval="1d", progress=False)
+if data.empty:
+    print("⚠ No se encontraron datos")
+    sys.exit(1)
+
+cierres = data["Close"]
+if isinstance(cierres, pd.Series):
+    cierres = cierres.to_frame(simbolos[0])
+cierres = cierres.dropna(axis=1, how="all")
+del data
+print(f"Panel: {cierres.shape[0]} ruedas x {cierres.shape[1]} símbolos")
+
+# Features y etiquetas se calculan en las ruedas propias de cada símbolo: en
+# el calendario unido un solo día sin dato dejaba en NaN la media de 200
+# ruedas durante las 200 siguientes y el RSI lo tomaba como rueda sin variación
+compacto, filas_originales = compactar_panel(cierres.to_numpy(dtype=np.float64))
+cierres_compactos = pd.DataFrame(compacto)
+features = descompactar(armar_features(cierres_compactos), filas_originales)
+etiquetas = descompactar((cierres_compactos.shift(-args.horizonte) / cierres_compactos - 1)
+                         .to_numpy(dtype=np.float32), filas_originales)
+# Las filas sin cierre quedan sin features ni etiqueta: las ventanas que las
+# incluyen se descartan
+sin_dato = cierres.isna().to_numpy()
+features[sin_dato] = np.nan
+etiquetas[sin_dato] = np.nan
+del compacto, cierres_compactos
+
+# === MUESTRAS VALIDAS ===
+# ventanas[t, s] es la vista de las ruedas t .. t+L-1 del símbolo s (sin copia)
+L = args.ventana
+ventanas = sliding_window_view(features, L, axis=0)          # (T-L+1, S, K, L)
+completas = sliding_window_view(np.isfinite(features).all(axis=-1), L, axis=0).all(axis=-1)
+etiqueta_fin = etiquetas[L - 1:]                              # etiqueta de la última rueda de cada ventana
+validas = completas & np.isfinite(etiqueta_fin)
+total = int(validas.sum())
+if total == 0:
+    print("⚠ No hay muestras completas con la ventana y el horizonte elegidos")
+    sys.exit(1)
+
+n_features = features.shape[-1]
+X = np.lib.format.open_memmap(os.path.join(CARPETA_SALIDA, "X.npy"), mode="w+",
+                              dtype=np.float32, shape=(total, L, n_features))
+y = np.lib.format.open_memmap(os.path.join(CARPETA_SALIDA, "y.npy"), mode="w+",
+                              dtype=np.float32, shape=(total,))
+fechas_muestras = np.lib.format.open_memmap(os.path.join(CARPETA_SALIDA, "fechas.npy"), mode="w+",
+                                            dtype="datetime64[D]", shape=(total,))
+simbolo_muestras = np.lib.format.open_memmap(os.path.join(CARPETA_SALIDA, "simbolo.npy"), mode="w+",
+                                             dtype=np.int32, shape=(total,))
+
+# Se copia a disco por bloques de fechas: solo las muestras de un bloque pasan por memoria
+fechas_panel = cierres.index.values.astype("datetime64[D]")
+posicion = 0
+for inicio in range(0, len(validas), args.bloque):
+    fin = min(inicio + args.bloque, len(validas))
+    filas, columnas = np.nonzero(validas[inicio:fin])
+    cantidad = len(filas)
+    if cantidad == 0:
+        continue
+    destino = slice(posicion, posicion + cantidad)
+    X[destino] = ventanas[inicio + filas, columnas].transpose(0, 2, 1)
+    y[destino] = etiqueta_fin[inicio + filas, columnas]
+    fechas_muestras[destino] = fechas_panel[inicio + filas + L - 1]
+    simbolo_muestras[destino] = columnas
+    posicion += cantidad
+
+for arreglo in (X, y, fechas_muestras, simbolo_muestras):
+    arreglo.flush()
+
+# === METADATOS Y PLIEGUES ===
+pliegues = pliegues_walk_forward(np.asarray(fechas_muestras), args.pliegues, args.horizonte)
+meta = {
+    "features": list(FEATURES),
+    "simbolos": [str(s) for s in cierres.columns],
+    "ventana": L,
+    "horizonte": args.horizonte,
+    "muestras": total,
+    "pliegues": pliegues,
+}
+with open(os.path.join(CARPETA_SALIDA, "meta.json"), "w", encoding="utf-8") as f:
+    json.dump(meta, f, indent=2, ensure_ascii=False)
+
+print(f"✓ {total} muestras de {L} ruedas x {n_features} features guardadas en '{CARPETA_SALIDA}/'")
+for i, pliegue in enumerate(pliegues, 1):
+    print(f"  Pliegue {i}: entrenamiento {pliegue['entrenamiento']}, prueba {pliegue['prueba']} "
+          f"({pliegue['fechas_prueba'][0]} a {pliegue['fechas_prueba'][1]})")
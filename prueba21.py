@@ -0,0 +1,144 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import os
+import sys
+
+# Rango y percentil de cada símbolo dentro del universo, fecha por fecha.
+#
+# Para cada rueda del panel se ordena a todos los símbolos por RSI,
+# Desvio_Max(%) y Desvio_Min(%) y se obtiene su rango (1 = menor valor) y su
+# percentil (0 = menor, 100 = mayor). Ej.: "PFE está en el percentil 10 de RSI hoy".
+# El ordenamiento se hace para todas las fechas a la vez con argsort por filas;
+# los símbolos sin dato en una fecha quedan fuera de esa fecha y los empates
+# reciben el rango promedio.
+#
+# Uso:
+#   python prueba21.py [--periodo 2y]
+#
+# Salidas:
+#   ranking.csv          rango y percentil de la última fecha (lo lee prueba12)
+#   rankings/rangos.npy       fechas x símbolos x métricas (float32)
+#   rankings/percentiles.npy  fechas x símbolos x métricas (float32)
+#   rankings/meta.json        fechas, símbolos y métricas de los arreglos
+
+CARPETA_SALIDA = "rankings"
+METRICAS = ("RSI", "Desvio_Max(%)", "Desvio_Min(%)")
+
+# === FUNCION PARA CALCULAR RSI MANUALMENTE ===
+def calcular_rsi(series, periodo=14):
+    delta = series.diff()
+    ganancia = delta.where(delta > 0, 0)
+    perdida = -delta.where(delta < 0, 0)
+
+    media_gan = ganancia.rolling(window=periodo).mean()
+    media_per = perdida.rolling(window=periodo).mean()
+
+    rs = media_gan / media_per
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+def rsi_por_simbolo(cierres, periodo=14):
+    """
+    RSI de cada columna calculado solo sobre sus ruedas con dato.
+    """
+    return cierres.apply(lambda serie: calcular_rsi(serie.dropna(), periodo).reindex(serie.index))
+
+# === RANGOS POR FILA ===
+def rangos_por_fila(valores):
+    """
+    Rango promedio (desde 1) de cada valor dentro de su fila, ignorando NaN.
+    Devuelve (rangos, percentiles) como float32; NaN donde no hay dato.
+    """
+    filas, columnas = valores.shape
+    validos = ~np.isnan(valores)
+
+    # argsort deja los NaN al final de cada fila
+    orden = np.argsort(valores, axis=1, kind="stable")
+    ordenados = np.take_along_axis(valores, orden, axis=1)
+
+    # Empates: cada tramo de valores iguales toma el promedio de su primera y
+    # última posición, calculadas con acumulados de máximo y mínimo por fila
+    posiciones = np.broadcast_to(np.arange(columnas), (filas, columnas))
+    inicio_tramo = np.ones((filas, columnas), dtype=bool)
+    inicio_tramo[:, 1:] = ordenados[:, 1:] != ordenados[:, :-1]
+    fin_tramo = np.ones((filas, columnas), dtype=bool)
+    fin_tramo[:, :-1] = inicio_tramo[:, 1:]
+    primera = np.maximum.accumulate(np.where(inicio_tramo, posiciones, 0), axis=1)
+    ultima = np.minimum.accumulate(np.where(fin_tramo, posiciones, columnas - 1)[:, ::-1], axis=1)[:, ::-1]
+
+    rangos = np.empty((filas, columnas), dtype=np.float32)
+    np.put_along_axis(rangos, orden, ((primera + ultima) / 2 + 1).astype(np.float32), axis=1)
+    rangos[~validos] = np.nan
+
+    cantidad = validos.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentiles = np.where(cantidad > 1, (rangos - 1) / (cantidad - 1) * 100, np.nan).astype(np.float32)
+    return rangos, percentiles
+
+# === ARGUMENTOS ===
+parser = argparse.ArgumentParser(description="Rangos y percentiles transversales por fecha")
+parser.add_argument("--periodo", default="2y", help="historia a descargar (por defecto 2y)")
+args = parser.parse_args()
+
+# Leer símbolos desde el archivo
+try:
+    with open("simbolos.txt", "r") as f:
+        simbolos = [line.strip().upper() for line in f if line.strip()]
+except FileNotFoundError:
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    sys.exit(1)
+
+os.makedirs(CARPETA_SALIDA, exist_ok=True)
+
+# === PANEL DE CIERRES ===
+print(f"Descargando cierres de {len(simbolos)} símbolos...")
+data = yf.download(simbolos, period=args.periodo, interval="1d", progress=False)
+if data.empty:
+    print("⚠ No se encontraron datos")
+    sys.exit(1)
+
+cierres = data["Close"]
+if isinstance(cierres, pd.Series):
+    cierres = cierres.to_frame(simbolos[0])
+cierres = cierres.dropna(axis=1, how="all")
+del data
+print(f"Panel: {cierres.shape[0]} ruedas x {cierres.shape[1]} símbolos")
+
+# Métricas históricas: en cada fecha, los desvíos se miden contra el máximo y
+# el mínimo de los 2 años anteriores, igual que en desvio.csv
+maximo = cierres.rolling(window=504, min_periods=1).max()
+minimo = cierres.rolling(window=504, min_periods=1).min()
+paneles = {
+    "RSI": rsi_por_simbolo(cierres),
+    "Desvio_Max(%)": (cierres - maximo) / maximo * 100,
+    "Desvio_Min(%)": (cierres - minimo) / minimo * 100,
+}
+
+rangos = np.empty(cierres.shape + (len(METRICAS),), dtype=np.float32)
+percentiles = np.empty_like(rangos)
+for i, metrica in enumerate(METRICAS):
+    rangos[..., i], percentiles[..., i] = rangos_por_fila(paneles[metrica].to_numpy(dtype=np.float64))
+
+np.save(os.path.join(CARPETA_SALIDA, "rangos.npy"), rangos)
+np.save(os.path.join(CARPETA_SALIDA, "percentiles.npy"), percentiles)
+with open(os.path.join(CARPETA_SALIDA, "meta.json"), "w", encoding="utf-8") as f:
+    json.dump({
+        "fechas": cierres.index.strftime("%Y-%m-%d").tolist(),
+        "simbolos": [str(s) for s in cierres.columns],
+        "metricas": list(METRICAS),
+    }, f, ensure_ascii=False)
+print(f"✓ Historial de rangos guardado en '{CARPETA_SALIDA}/' ({rangos.shape[0]} fechas)")
+
+# === ULTIMA FECHA ===
+df_ranking = pd.DataFrame({"Simbolo": [str(s) for s in cierres.columns]})
+for i, metrica in enumerate(METRICAS):
+    nombre = metrica.replace("(%)", "")
+    df_ranking[f"{nombre}_Rango"] = rangos[-1, :, i]
+    df_ranking[f"{nombre}_Percentil"] = np.round(percentiles[-1, :, i], 1)
+
+df_ranking.to_csv("ranking.csv", index=False, sep=";")
+print(f"✓ Archivo 'ranking.csv' generado correctamente ({len(df_ranking)} registros, "
+      f"fecha {cierres.index[-1].strftime('%Y-%m-%d')})")
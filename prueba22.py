@@ -0,0 +1,252 @@
+import pandas as pd
+import numpy as np
+from scipy.signal import argrelextrema
+from abc import ABC, abstractmethod
+import argparse
+import os
+import re
+import sys
+import zlib
+
+# Origen de datos intercambiable.
+#
+# La etapa de descarga ya no llama a yfinance directamente sino a un
+# proveedor con un único método descargar(simbolo, periodo, intervalo):
+#   yahoo       -> yfinance (requiere red)
+#   directorio  -> archivos locales <SIMBOLO>.parquet o <SIMBOLO>.csv
+#   replay      -> series sintéticas deterministas (misma semilla, mismos datos)
+# Así las corridas de rendimiento y de control pueden hacerse sin red, con el
+# mismo código, a la velocidad del disco.
+#
+# Uso:
+#   python prueba22.py --proveedor yahoo [--grabar datos]
+#   python prueba22.py --proveedor directorio --carpeta datos
+#   python prueba22.py --proveedor replay [--semilla 0]
+
+COLUMNAS = ["Open", "High", "Low", "Close", "Volume"]
+
+# === FUNCION PARA CALCULAR RSI MANUALMENTE ===
+def calcular_rsi(series, periodo=14):
+    delta = series.diff()
+    ganancia = delta.where(delta > 0, 0)
+    perdida = -delta.where(delta < 0, 0)
+
+    media_gan = ganancia.rolling(window=periodo).mean()
+    media_per = perdida.rolling(window=periodo).mean()
+
+    rs = media_gan / media_per
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+# === PERIODOS ===
+def periodo_a_desplazamiento(periodo):
+    """
+    Convierte un período al estilo de yfinance ('2y', '6mo', '30d', 'max')
+    en un pd.DateOffset. 'max' devuelve None (toda la serie).
+    """
+    if periodo == "max":
+        return None
+    coincidencia = re.fullmatch(r"(\d+)(y|mo|wk|d)", periodo)
+    if not coincidencia:
+        raise ValueError(f"Período no reconocido: '{periodo}'")
+    cantidad, unidad = int(coincidencia.group(1)), coincidencia.group(2)
+    return {
+        "y": pd.DateOffset(years=cantidad),
+        "mo": pd.DateOffset(months=cantidad),
+        "wk": pd.DateOffset(weeks=cantidad),
+        "d": pd.DateOffset(days=cantidad),
+    }[unidad]
+
+def recortar(data, periodo):
+    """
+    Deja solo el período pedido, contado hacia atrás desde la última fecha de
+    la serie (no desde hoy, para que el resultado no dependa del día).
+    """
+    desplazamiento = periodo_a_desplazamiento(periodo)
+    if desplazamiento is None or data.empty:
+        return data
+    return data.loc[data.index > data.index[-1] - desplazamiento]
+
+# === PROVEEDORES ===
+class ProveedorDatos(ABC):
+    """
+    Interfaz común. descargar() devuelve un DataFrame con columnas
+    Open/High/Low/Close/Volume indexado por fecha, o un DataFrame vacío si
+    no hay datos para el símbolo. Un proveedor que no implemente descargar()
+    falla al crearse, no en medio de la corrida.
+    """
+
+    @abstractmethod
+    def descargar(self, simbolo, periodo="2y", intervalo="1d"):
+        ...
+
+class ProveedorYahoo(ProveedorDatos):
+    def __init__(self):
+        # Importación diferida: los otros proveedores funcionan sin yfinance instalado
+        import yfinance
+        self.yf = yfinance
+
+    def descargar(self, simbolo, periodo="2y", intervalo="1d"):
+        data = self.yf.download(simbolo, period=periodo, interval=intervalo, progress=False)
+        # Las versiones nuevas de yfinance devuelven columnas (Precio, Símbolo)
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        return data
+
+class ProveedorDirectorio(ProveedorDatos):
+    """
+    Lee <carpeta>/<SIMBOLO>.parquet o <carpeta>/<SIMBOLO>.csv. Los CSV se leen
+    con memory_map para no copiar el archivo a un buffer intermedio; Parquet
+    necesita pyarrow.
+    """
+
+    def __init__(self, carpeta):
+        self.carpeta = carpeta
+
+    def descargar(self, simbolo, periodo="2y", intervalo="1d"):
+        if intervalo != "1d":
+            raise ValueError("El proveedor de directorio solo tiene datos diarios")
+        ruta_parquet = os.path.join(self.carpeta, f"{simbolo}.parquet")
+        ruta_csv = os.path.join(self.carpeta, f"{simbolo}.csv")
+        if os.path.exists(ruta_parquet):
+            data = pd.read_parquet(ruta_parquet, memory_map=True)
+        elif os.path.exists(ruta_csv):
+            data = pd.read_csv(ruta_csv, index_col=0, parse_dates=True, memory_map=True)
+        else:
+            return pd.DataFrame(columns=COLUMNAS)
+        return recortar(data.sort_index(), periodo)
+
+    def guardar(self, simbolo, data):
+        os.makedirs(self.carpeta, exist_ok=True)
+        data[[c for c in COLUMNAS if c in data.columns]].to_csv(
+            os.path.join(self.carpeta, f"{simbolo}.csv"), index_label="Date")
+
+class ProveedorReplay(ProveedorDatos):
+    """
+    Genera series diarias sintéticas (camino aleatorio geométrico) a partir
+    de la semilla y el símbolo. Mismos argumentos, mismos datos: sirve para
+    pruebas de rendimiento y de control sin red.
+    """
+
+    def __init__(self, semilla=0, fecha_fin="2024-12-31", largo_max=5040):
+        self.semilla = semilla
+        self.fecha_fin = pd.Timestamp(fecha_fin)
+        self.largo_max = largo_max
+
+    def descargar(self, simbolo, periodo="2y", intervalo="1d"):
+        if intervalo != "1d":
+            raise ValueError("El proveedor de replay solo genera datos diarios")
+        # crc32 en lugar de hash(): hash() de str cambia entre ejecuciones
+        rng = np.random.default_rng(zlib.crc32(f"{self.semilla}:{simbolo}".encode("utf-8")))
+        fechas = pd.bdate_range(end=self.fecha_fin, periods=self.largo_max, name="Date")
+
+        precio_inicial = rng.uniform(5, 200)
+        cierre = precio_inicial * np.exp(np.cumsum(rng.normal(0.0002, 0.02, self.largo_max)))
+        apertura = cierre * (1 + rng.normal(0, 0.005, self.largo_max))
+        maximo = np.maximum(apertura, cierre) * (1 + rng.uniform(0, 0.015, self.largo_max))
+        minimo = np.minimum(apertura, cierre) * (1 - rng.uniform(0, 0.015, self.largo_max))
+        volumen = rng.integers(100_000, 10_000_000, self.largo_max).astype(np.float64)
+
+        data = pd.DataFrame({"Open": apertura, "High": maximo, "Low": minimo,
+                             "Close": cierre, "Volume": volumen}, index=fechas)
+        return recortar(data, periodo)
+
+def crear_proveedor(nombre, carpeta="datos", semilla=0):
+    if nombre == "yahoo":
+        return ProveedorYahoo()
+    if nombre == "directorio":
+        return ProveedorDirectorio(carpeta)
+    if nombre == "replay":
+        return ProveedorReplay(semilla)
+    raise ValueError(f"Proveedor desconocido: '{nombre}'")
+
+# === ETAPA DE DESCARGA ===
+def obtener_datos(proveedor, simbolos, periodo="2y", grabador=None):
+    """
+    Recorre los símbolos pidiendo los datos al proveedor. Si se pasa un
+    'grabador' (ProveedorDirectorio), cada serie descargada se guarda para
+    poder repetir la corrida sin red.
+    """
+    for simbolo in simbolos:
+        print(f"Procesando {simbolo}...")
+        try:
+            data = proveedor.descargar(simbolo, periodo=periodo)
+        except Exception as e:
+            print(f"  ✗ Error descargando {simbolo}: {str(e)}")
+            continue
+        if data.empty:
+            print(f"  ⚠ No se encontraron datos para {simbolo}")
+            continue
+        if grabador is not None:
+            grabador.guardar(simbolo, data)
+        yield simbolo, data
+
+# prueba24 importa los proveedores de este archivo: la corrida queda bajo __main__.
+if __name__ == "__main__":
+    # === ARGUMENTOS ===
+    parser = argparse.ArgumentParser(description="Corrida con origen de datos intercambiable")
+    parser.add_argument("--proveedor", choices=["yahoo", "directorio", "replay"], default="yahoo",
+                        help="origen de los datos (por defecto yahoo)")
+    parser.add_argument("--carpeta", default="datos", help="carpeta del proveedor de directorio (por defecto 'datos')")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla del proveedor de replay (por defecto 0)")
+    parser.add_argument("--periodo", default="2y", help="historia a usar (por defecto 2y)")
+    parser.add_argument("--grabar", metavar="CARPETA",
+                        help="guardar cada serie obtenida como CSV en CARPETA")
+    args = parser.parse_args()
+
+    # Leer símbolos desde el archivo
+    try:
+        with open("simbolos.txt", "r") as f:
+            simbolos = [line.strip().upper() for line in f if line.strip()]
+    except FileNotFoundError:
+        print("Error: No se encontró el archivo 'simbolos.txt'")
+        sys.exit(1)
+
+    proveedor = crear_proveedor(args.proveedor, carpeta=args.carpeta, semilla=args.semilla)
+    grabador = ProveedorDirectorio(args.grabar) if args.grabar else None
+
+    resultados_desvio = []
+    resultados_rsi = []
+
+    for simbolo, data in obtener_datos(proveedor, simbolos, periodo=args.periodo, grabador=grabador):
+        try:
+            precios = data["Close"].astype(np.float64)
+
+            ultimo_rsi = float(calcular_rsi(precios).iloc[-1])
+            resultados_rsi.append({
+                "Simbolo": simbolo,
+                "RSI": round(ultimo_rsi, 2) if not np.isnan(ultimo_rsi) else np.nan
+            })
+
+            maxima_idx = argrelextrema(precios.values, np.greater_equal, order=5)[0]
+            minima_idx = argrelextrema(precios.values, np.less_equal, order=5)[0]
+
+            max_global = float(precios.max())
+            min_global = float(precios.min())
+            ultima = float(precios.iloc[-1])
+
+            desvio_max = ((ultima - max_global) / max_global) * 100
+            desvio_min = ((ultima - min_global) / min_global) * 100
+
+            resultados_desvio.append({
+                "Simbolo": simbolo,
+                "Ultimo_Cierre": round(ultima, 2),
+                "Maximo_Serie": round(max_global, 2),
+                "Minimo_Serie": round(min_global, 2),
+                "Desvio_Max(%)": round(desvio_max, 2),
+                "Desvio_Min(%)": round(desvio_min, 2)
+            })
+            print(f"  ✓ {len(precios)} ruedas, {len(maxima_idx)} máximos y {len(minima_idx)} mínimos parciales")
+
+        except Exception as e:
+            print(f"  ✗ Error procesando {simbolo}: {str(e)}")
+            continue
+
+    # === GUARDAR RESULTADOS ===
+    df_desvio = pd.DataFrame(resultados_desvio)
+    df_desvio.to_csv("desvio.csv", index=False, sep=";")
+    print(f"\n✓ Archivo 'desvio.csv' generado correctamente ({len(resultados_desvio)} registros)")
+
+    df_rsi = pd.DataFrame(resultados_rsi)
+    df_rsi.to_csv("rsi.csv", index=False, sep=";")
+    print(f"✓ Archivo 'rsi.csv' generado correctamente ({len(resultados_rsi)} registros)")
@@ -0,0 +1,139 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+import argparse
+import sys
+
+# Exportación en bloque de las tablas de resultados.
+#
+# En lugar de armar un diccionario por símbolo, redondear valor por valor y
+# mezclar números con "N/A", las métricas se calculan para todo el panel de
+# cierres a la vez y las tablas se arman directamente con columnas tipadas
+# (Float64 con nulos reales). Un único escritor genera CSV, Parquet y JSON.
+#
+# Uso:
+#   python prueba23.py [--formatos csv,parquet,json]
+
+FORMATOS = ("csv", "parquet", "json")
+
+# === FUNCION PARA CALCULAR RSI MANUALMENTE ===
+def calcular_rsi(series, periodo=14):
+    delta = series.diff()
+    ganancia = delta.where(delta > 0, 0)
+    perdida = -delta.where(delta < 0, 0)
+
+    media_gan = ganancia.rolling(window=periodo).mean()
+    media_per = perdida.rolling(window=periodo).mean()
+
+    rs = media_gan / media_per
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+def rsi_por_simbolo(cierres, periodo=14):
+    """
+    RSI de cada columna calculado solo sobre sus ruedas con dato.
+    """
+    return cierres.apply(lambda serie: calcular_rsi(serie.dropna(), periodo).reindex(serie.index))
+
+# === COLUMNAS TIPADAS ===
+def columna(valores, decimales=2):
+    """
+    Redondea todo el arreglo de una vez y lo convierte a Float64 de pandas,
+    donde los NaN pasan a ser nulos (<NA>) en lugar de texto.
+    """
+    return pd.array(np.round(np.asarray(valores, dtype=np.float64), decimales), dtype="Float64")
+
+def ultimo_valido(valores):
+    """
+    Posición de la última fila con dato de cada columna (fechas x símbolos).
+    """
+    con_dato = ~np.isnan(valores)
+    return len(valores) - 1 - np.argmax(con_dato[::-1], axis=0)
+
+# === ESCRITOR UNICO ===
+def exportar_tabla(tabla, nombre, formatos=FORMATOS):
+    """
+    Escribe 'tabla' como <nombre>.csv, <nombre>.parquet y/o <nombre>.json.
+    Parquet requiere pyarrow; si no está instalado se avisa y se sigue.
+    """
+    rutas = []
+    for formato in formatos:
+        ruta = f"{nombre}.{formato}"
+        if formato == "csv":
+            tabla.to_csv(ruta, index=False, sep=";", na_rep="")
+        elif formato == "parquet":
+            try:
+                tabla.to_parquet(ruta, index=False)
+            except ImportError:
+                print(f"  ⚠ No se generó '{ruta}': falta instalar pyarrow")
+                continue
+        elif formato == "json":
+            tabla.to_json(ruta, orient="records", force_ascii=False)
+        else:
+            raise ValueError(f"Formato desconocido: '{formato}'")
+        rutas.append(ruta)
+    print(f"✓ {len(tabla)} registros exportados: {', '.join(rutas)}")
+
+# === ARGUMENTOS ===
+parser = argparse.ArgumentParser(description="Exportación en bloque de rsi y desvio")
+parser.add_argument("--formatos", default=",".join(FORMATOS),
+                    help=f"formatos separados por comas (por defecto {','.join(FORMATOS)})")
+args = parser.parse_args()
+
+formatos = tuple(f.strip().lower() for f in args.formatos.split(",") if f.strip())
+if set(formatos) - set(FORMATOS):
+    print(f"Error: formatos válidos: {', '.join(FORMATOS)}")
+    sys.exit(1)
+
+# Leer símbolos desde el archivo
+try:
+    with open("simbolos.txt", "r") as f:
+        simbolos = [line.strip().upper() for line in f if line.strip()]
+except FileNotFoundError:
+    print("Error: No se encontró el archivo 'simbolos.txt'")
+    sys.exit(1)
+
+# === PANEL DE CIERRES ===
+print(f"Descargando cierres de {len(simbolos)} símbolos...")
+data = yf.download(simbolos, period="2y", interval="1d", progress=False)
+if data.empty:
+    print("⚠ No se encontraron datos")
+    sys.exit(1)
+
+cierres = data["Close"]
+if isinstance(cierres, pd.Series):
+    cierres = cierres.to_frame(simbolos[0])
+# Mantener el orden de simbolos.txt y descartar los que no tienen datos
+cierres = cierres.reindex(columns=[s for s in simbolos if s in cierres.columns]).dropna(axis=1, how="all")
+del data
+
+# === METRICAS VECTORIZADAS ===
+valores = cierres.to_numpy(dtype=np.float64)
+columnas = np.arange(valores.shape[1])
+fila_ultima = ultimo_valido(valores)
+
+ultima = valores[fila_ultima, columnas]
+max_global = np.nanmax(valores, axis=0)
+min_global = np.nanmin(valores, axis=0)
+# Un día sin dato de un símbolo no cuenta como rueda sin variación
+rsi = rsi_por_simbolo(cierres).to_numpy()[fila_ultima, columnas]
+
+tabla_simbolos = pd.array(cierres.columns.astype(str), dtype="string")
+
+df_rsi = pd.DataFrame({
+    "Simbolo": tabla_simbolos,
+    "RSI": columna(rsi),
+})
+
+df_desvio = pd.DataFrame({
+    "Simbolo": tabla_simbolos,
+    "Ultimo_Cierre": columna(ultima),
+    "Maximo_Serie": columna(max_global),
+    "Minimo_Serie": columna(min_global),
+    "Desvio_Max(%)": columna((ultima - max_global) / max_global * 100),
+    "Desvio_Min(%)": columna((ultima - min_global) / min_global * 100),
+})
+
+# === GUARDAR RESULTADOS ===
+exportar_tabla(df_rsi, "rsi", formatos)
+exportar_tabla(df_desvio, "desvio", formatos)
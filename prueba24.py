@@ -0,0 +1,446 @@
+import pandas as pd
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # los gráficos solo se guardan, nunca se muestran
+import matplotlib.pyplot as plt
+from scipy.signal import argrelextrema
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from prueba22 import crear_proveedor
+
+# Planificador que superpone descarga, cálculo y gráficos.
+#
+# Las tres etapas corren a la vez, unidas por colas acotadas:
+#   descarga  -> hilos (la espera es de red, no de CPU)
+#   cálculo   -> hilo principal, por lotes: los símbolos que esperan en la
+#                cola se procesan juntos como un panel
+#   gráficos  -> pool de procesos (savefig usa CPU y no libera el GIL)
+# Si una etapa se atrasa, la cola que la alimenta se llena y la anterior
+# espera (contrapresión). Un controlador mira la cola de cálculo y agrega o
+# quita hilos de descarga según haga falta. Al final se informa la
+# utilización de cada etapa.
+#
+# Los datos se piden a un proveedor de prueba22 (yahoo, directorio o
+# replay), así el informe de rendimiento también se puede obtener sin red.
+#
+# Uso:
+#   python prueba24.py [--descargas 4] [--max-descargas 16] [--procesos 2] [--lote 32]
+#                      [--proveedor yahoo|directorio|replay] [--carpeta datos] [--semilla 0]
+
+# === FUNCION PARA CALCULAR RSI MANUALMENTE ===
+def calcular_rsi(series, periodo=14):
+    delta = series.diff()
+    ganancia = delta.where(delta > 0, 0)
+    perdida = -delta.where(delta < 0, 0)
+
+    media_gan = ganancia.rolling(window=periodo).mean()
+    media_per = perdida.rolling(window=periodo).mean()
+
+    rs = media_gan / media_per
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+# === ESTADISTICAS POR ETAPA ===
+class EstadisticaEtapa:
+    """
+    Acumula tiempo ocupado, tiempo disponible (trabajadores x segundos vivos)
+    y cantidad de ítems de una etapa. Es segura entre hilos.
+    """
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.lock = threading.Lock()
+        self.ocupado = 0.0
+        self.disponible = 0.0
+        self.items = 0
+        self.trabajadores_max = 0
+
+    def sumar(self, ocupado=0.0, disponible=0.0, items=0):
+        with self.lock:
+            self.ocupado += ocupado
+            self.disponible += disponible
+            self.items += items
+
+    def utilizacion(self):
+        with self.lock:
+            return self.ocupado / self.disponible if self.disponible else 0.0
+
+    def informe(self, duracion):
+        return (f"  {self.nombre:<10} trabajadores máx: {self.trabajadores_max:>2}  "
+                f"ítems: {self.items:>5}  ocupado: {self.ocupado:7.1f} s  "
+                f"utilización: {self.utilizacion() * 100:5.1f}%  "
+                f"ritmo: {self.items / duracion if duracion else 0:6.1f} ítems/s")
+
+# === ETAPA DE DESCARGA (HILOS) ===
+class Descargas:
+    """
+    Grupo de hilos de descarga con tamaño ajustable en marcha. Cada hilo toma
+    símbolos de 'pendientes', los pide a 'proveedor' y deja (simbolo, cierre)
+    en 'salida'. Cuando el último hilo termina y no quedan símbolos, pone
+    None en 'salida'.
+    """
+
+    def __init__(self, pendientes, salida, estadistica, proveedor, periodo="2y", minimo=1, maximo=16):
+        self.pendientes = pendientes
+        self.proveedor = proveedor
+        self.periodo = periodo
+        self.salida = salida
+        self.estadistica = estadistica
+        self.minimo = minimo
+        self.maximo = maximo
+        self.lock = threading.Lock()
+        self.activos = 0
+        self.objetivo = 0
+        self.terminado = False
+
+    def ajustar(self, cantidad):
+        """
+        Fija la cantidad deseada de hilos. Si es mayor que la actual se lanzan
+        hilos nuevos; si es menor, los sobrantes terminan al acabar su descarga.
+        """
+        with self.lock:
+            if self.terminado:
+                return
+            self.objetivo = max(self.minimo, min(self.maximo, cantidad))
+            while self.activos < self.objetivo and not self.pendientes.empty():
+                self.activos += 1
+                threading.Thread(target=self._trabajar, daemon=True).start()
+            self.estadistica.trabajadores_max = max(self.estadistica.trabajadores_max, self.activos)
+
+    def _trabajar(self):
+        inicio_hilo = time.perf_counter()
+        retirado = False
+        try:
+            while True:
+                with self.lock:
+                    # Sobran hilos: este se retira (el descuento va dentro del lock
+                    # para que no se retiren dos a la vez por el mismo sobrante)
+                    if self.activos > self.objetivo:
+                        self.activos -= 1
+                        retirado = True
+                        break
+                try:
+                    simbolo = self.pendientes.get_nowait()
+                except queue.Empty:
+                    break
+                # Un error en un símbolo no puede terminar el hilo: si el último
+                # hilo muere sin llegar al finally, nadie pone la marca de cierre
+                # y el cálculo espera para siempre
+                try:
+                    self._descargar(simbolo)
+                except Exception as e:
+                    print(f"  ✗ Error procesando {simbolo}: {str(e)}")
+        finally:
+            ultimo = False
+            if not retirado:
+                with self.lock:
+                    self.activos -= 1
+                    ultimo = self.activos == 0 and self.pendientes.empty()
+                    if ultimo:
+                        self.terminado = True
+            self.estadistica.sumar(disponible=time.perf_counter() - inicio_hilo)
+            if ultimo:
+                self.salida.put(None)
+
+    def _descargar(self, simbolo):
+        inicio = time.perf_counter()
+        try:
+            data = self.proveedor.descargar(simbolo, periodo=self.periodo)
+        finally:
+            self.estadistica.sumar(ocupado=time.perf_counter() - inicio, items=1)
+
+        if data.empty:
+            print(f"  ⚠ No se encontraron datos para {simbolo}")
+            return
+        cierre = pd.Series(data["Close"].to_numpy().ravel(), index=data.index, name=simbolo)
+        # put() bloquea si el cálculo va atrasado: contrapresión
+        self.salida.put((simbolo, cierre))
+
+def controlar(descargas, cola_calculo, estadistica, intervalo=1.0):
+    """
+    Cada 'intervalo' segundos compara la ocupación de la cola de cálculo:
+    si está casi vacía y los hilos de descarga están ocupados, el cálculo
+    espera datos y se agrega un hilo; si está casi llena, sobra descarga y se
+    quita uno.
+    """
+    ocupado_previo = estadistica.ocupado
+    while not descargas.terminado:
+        time.sleep(intervalo)
+        with estadistica.lock:
+            ocupado = estadistica.ocupado
+        utilizacion = (ocupado - ocupado_previo) / (intervalo * max(descargas.activos, 1))
+        ocupado_previo = ocupado
+
+        llenado = cola_calculo.qsize() / cola_calculo.maxsize
+        if llenado < 0.25 and utilizacion > 0.8:
+            descargas.ajustar(descargas.objetivo + 1)
+        elif llenado > 0.75:
+            descargas.ajustar(descargas.objetivo - 1)
+
+# === ETAPA DE CALCULO (POR LOTES) ===
+def tomar_lote(cola, tamanio):
+    """
+    Espera el primer ítem y luego toma, sin esperar, todos los que ya estén
+    en la cola hasta 'tamanio'. Devuelve (lote, fin) donde fin indica que
+    llegó la marca de cierre.
+    """
+    primero = cola.get()
+    if primero is None:
+        return [], True
+    lote = [primero]
+    while len(lote) < tamanio:
+        try:
+            item = cola.get_nowait()
+        except queue.Empty:
+            break
+        if item is None:
+            return lote, True
+        lote.append(item)
+    return lote, False
+
+def calcular_lote(lote):
+    """
+    Agrupa las series del lote por calendario (exactamente las mismas fechas)
+    y calcula cada grupo como un panel. Devuelve filas de rsi, de desvío y los
+    datos de cada gráfico.
+    """
+    grupos = {}
+    for simbolo, cierre in lote:
+        # La clave son las fechas completas: dos series con el mismo largo y
+        # los mismos extremos pueden diferir en el medio
+        clave = cierre.index.asi8.tobytes()
+        grupos.setdefault(clave, []).append(cierre)
+
+    filas_rsi, filas_desvio, graficos = [], [], []
+    for series in grupos.values():
+        try:
+            resultado = calcular_grupo(series)
+        except Exception:
+            # Se repite símbolo por símbolo para que el error de uno no se
+            # lleve al resto del grupo
+            resultado = ([], [], [])
+            for serie in series:
+                try:
+                    parcial = calcular_grupo([serie])
+                except Exception as e:
+                    print(f"  ✗ Error procesando {serie.name}: {str(e)}")
+                    continue
+                for acumulado, filas in zip(resultado, parcial):
+                    acumulado.extend(filas)
+        filas_rsi.extend(resultado[0])
+        filas_desvio.extend(resultado[1])
+        graficos.extend(resultado[2])
+    return filas_rsi, filas_desvio, graficos
+
+def calcular_grupo(series):
+    """
+    Calcula como un panel un grupo de series con el mismo calendario.
+    """
+    filas_rsi, filas_desvio, graficos = [], [], []
+    panel = pd.concat(series, axis=1)
+    rsi = calcular_rsi(panel)
+    ma50 = panel.rolling(window=50).mean()
+    ma200 = panel.rolling(window=200).mean()
+    valores = panel.to_numpy()
+
+    ultima = valores[-1]
+    # nanmax/nanmin: como .max()/.min() de pandas en prueba09, un cierre
+    # faltante no anula el desvío del símbolo
+    max_global = np.nanmax(valores, axis=0)
+    min_global = np.nanmin(valores, axis=0)
+    desvio_max = (ultima - max_global) / max_global * 100
+    desvio_min = (ultima - min_global) / min_global * 100
+    ultimo_rsi = rsi.to_numpy()[-1]
+
+    filas_max, columnas_max = argrelextrema(valores, np.greater_equal, axis=0, order=5)
+    filas_min, columnas_min = argrelextrema(valores, np.less_equal, axis=0, order=5)
+
+    for j, simbolo in enumerate(panel.columns):
+        filas_rsi.append([simbolo, round(float(ultimo_rsi[j]), 2) if not np.isnan(ultimo_rsi[j]) else np.nan])
+        filas_desvio.append([simbolo, round(float(ultima[j]), 2), round(float(max_global[j]), 2),
+                             round(float(min_global[j]), 2), round(float(desvio_max[j]), 2),
+                             round(float(desvio_min[j]), 2)])
+        graficos.append({
+            "simbolo": simbolo,
+            "fechas": panel.index.values,
+            "cierre": valores[:, j],
+            "ma50": ma50.iloc[:, j].to_numpy(),
+            "ma200": ma200.iloc[:, j].to_numpy(),
+            "rsi": rsi.iloc[:, j].to_numpy(),
+            "idx_max": filas_max[columnas_max == j],
+            "idx_min": filas_min[columnas_min == j],
+            "ultimo_rsi": float(ultimo_rsi[j]),
+            "desvio_max": float(desvio_max[j]),
+            "desvio_min": float(desvio_min[j]),
+        })
+    return filas_rsi, filas_desvio, graficos
+
+# === ETAPA DE GRAFICOS (PROCESOS) ===
+def renderizar(g):
+    """
+    Dibuja el gráfico de dos paneles de prueba09. Corre en otro proceso y
+    devuelve (ruta, segundos ocupados) para la estadística de la etapa.
+    """
+    inicio = time.perf_counter()
+    fechas = g["fechas"]
+    ultima = float(g["cierre"][-1])
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 7), sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+
+    # ----- Panel superior: cotización -----
+    ax1.plot(fechas, g["cierre"], label="Cierre", color="blue", linewidth=1)
+    ax1.plot(fechas, g["ma50"], label="Media 50 ruedas", color="orange", linewidth=1.2)
+    ax1.plot(fechas, g["ma200"], label="Media 200 ruedas", color="purple", linewidth=1.2)
+    ax1.scatter(fechas[g["idx_max"]], g["cierre"][g["idx_max"]], color="red", label="Máximos parciales", marker="^")
+    ax1.scatter(fechas[g["idx_min"]], g["cierre"][g["idx_min"]], color="green", label="Mínimos parciales", marker="v")
+    ax1.axhline(y=ultima, color="gray", linestyle="--", linewidth=1, label=f"Último precio ({ultima:.2f})")
+    ax1.set_title(f"{g['simbolo']} - Cotización últimos 2 años")
+    ax1.set_ylabel("Precio de Cierre (USD)")
+    ax1.legend()
+    ax1.grid(True)
+
+    # Texto con RSI y desvíos
+    texto_info = (
+        f"RSI (14): {g['ultimo_rsi']:.2f}\n"
+        f"Desvío Máx: {g['desvio_max']:.2f}%\n"
+        f"Desvío Mín: {g['desvio_min']:.2f}%"
+    )
+    ax1.text(0.02, 0.95, texto_info, transform=ax1.transAxes,
+             fontsize=9, verticalalignment='top', bbox=dict(facecolor='white', alpha=0.7, edgecolor='gray'))
+
+    # ----- Panel inferior: RSI -----
+    ax2.plot(fechas, g["rsi"], color="magenta", label="RSI (14)", linewidth=1)
+    ax2.axhline(70, color="red", linestyle="--", linewidth=1)
+    ax2.axhline(30, color="green", linestyle="--", linewidth=1)
+    ax2.set_ylabel("RSI (14)")
+    ax2.set_xlabel("Fecha")
+    ax2.legend()
+    ax2.grid(True)
+    ax2.set_ylim(0, 100)
+
+    plt.tight_layout()
+
+    ruta_img = os.path.join("graficos", f"{g['simbolo']}.png")
+    plt.savefig(ruta_img)
+    plt.close(fig)
+    return ruta_img, time.perf_counter() - inicio
+
+# El pool de procesos arranca con 'spawn' y vuelve a importar este archivo en
+# cada proceso hijo: la corrida tiene que quedar bajo __main__.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Descarga, cálculo y gráficos superpuestos")
+    parser.add_argument("--descargas", type=int, default=4, help="hilos de descarga iniciales (por defecto 4)")
+    parser.add_argument("--max-descargas", type=int, default=16, help="hilos de descarga máximos (por defecto 16)")
+    parser.add_argument("--procesos", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="procesos para gráficos (por defecto núcleos - 1)")
+    parser.add_argument("--lote", type=int, default=32, help="símbolos máximos por lote de cálculo (por defecto 32)")
+    parser.add_argument("--capacidad", type=int, default=64,
+                        help="símbolos en espera entre descarga y cálculo (por defecto 64)")
+    parser.add_argument("--proveedor", choices=["yahoo", "directorio", "replay"], default="yahoo",
+                        help="origen de los datos (por defecto yahoo)")
+    parser.add_argument("--carpeta", default="datos", help="carpeta del proveedor de directorio (por defecto 'datos')")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla del proveedor de replay (por defecto 0)")
+    parser.add_argument("--periodo", default="2y", help="historia a usar (por defecto 2y)")
+    args = parser.parse_args()
+
+    # Leer símbolos desde el archivo
+    try:
+        with open("simbolos.txt", "r") as f:
+            simbolos = [line.strip().upper() for line in f if line.strip()]
+    except FileNotFoundError:
+        print("Error: No se encontró el archivo 'simbolos.txt'")
+        sys.exit(1)
+
+    os.makedirs("graficos", exist_ok=True)
+    print(f"Se encontraron {len(simbolos)} símbolos para procesar\n")
+
+    estadistica_descarga = EstadisticaEtapa("descarga")
+    estadistica_calculo = EstadisticaEtapa("cálculo")
+    estadistica_graficos = EstadisticaEtapa("gráficos")
+    estadistica_calculo.trabajadores_max = 1
+    estadistica_graficos.trabajadores_max = args.procesos
+
+    pendientes = queue.Queue()
+    for simbolo in simbolos:
+        pendientes.put(simbolo)
+    cola_calculo = queue.Queue(maxsize=args.capacidad)
+
+    inicio_corrida = time.perf_counter()
+    proveedor = crear_proveedor(args.proveedor, carpeta=args.carpeta, semilla=args.semilla)
+    descargas = Descargas(pendientes, cola_calculo, estadistica_descarga, proveedor,
+                          periodo=args.periodo, maximo=args.max_descargas)
+    if simbolos:
+        descargas.ajustar(args.descargas)
+        threading.Thread(target=controlar, args=(descargas, cola_calculo, estadistica_descarga),
+                         daemon=True).start()
+    else:
+        cola_calculo.put(None)
+
+    resultados_rsi = []
+    resultados_desvio = []
+
+    # Como mucho 2 gráficos en espera por proceso: si los gráficos se atrasan,
+    # el cálculo se frena y con él la descarga
+    cupos_graficos = threading.BoundedSemaphore(2 * args.procesos)
+    errores_graficos = []
+
+    def grafico_terminado(futuro):
+        cupos_graficos.release()
+        try:
+            ruta, segundos = futuro.result()
+            estadistica_graficos.sumar(ocupado=segundos, items=1)
+        except Exception as e:
+            errores_graficos.append(str(e))
+
+    # 'spawn' y no 'fork' (el predeterminado en Linux): los procesos se crean
+    # con los hilos de descarga ya corriendo, y un fork copiaría locks tomados
+    # por esos hilos que nadie liberaría en el hijo
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.procesos, mp_context=contexto) as pool:
+        fin = False
+        while not fin:
+            lote, fin = tomar_lote(cola_calculo, args.lote)
+            if not lote:
+                continue
+            inicio = time.perf_counter()
+            filas_rsi, filas_desvio, graficos = calcular_lote(lote)
+            estadistica_calculo.sumar(ocupado=time.perf_counter() - inicio, items=len(lote))
+            resultados_rsi.extend(filas_rsi)
+            resultados_desvio.extend(filas_desvio)
+            print(f"  ✓ Lote de {len(lote)} símbolos calculado ({len(resultados_rsi)}/{len(simbolos)})")
+
+            for g in graficos:
+                cupos_graficos.acquire()
+                pool.submit(renderizar, g).add_done_callback(grafico_terminado)
+
+    duracion = time.perf_counter() - inicio_corrida
+    estadistica_calculo.sumar(disponible=duracion)
+    estadistica_graficos.sumar(disponible=duracion * args.procesos)
+
+    for error in errores_graficos:
+        print(f"  ✗ Error generando gráfico: {error}")
+
+    # Los lotes terminan en el orden en que llegan las descargas: se vuelve al de simbolos.txt
+    posicion = {simbolo: i for i, simbolo in enumerate(simbolos)}
+    resultados_rsi.sort(key=lambda fila: posicion[fila[0]])
+    resultados_desvio.sort(key=lambda fila: posicion[fila[0]])
+
+    # === GUARDAR RESULTADOS ===
+    df_desvio = pd.DataFrame(resultados_desvio, columns=["Simbolo", "Ultimo_Cierre", "Maximo_Serie",
+                                                         "Minimo_Serie", "Desvio_Max(%)", "Desvio_Min(%)"])
+    df_desvio.to_csv("desvio.csv", index=False, sep=";")
+    print("\nArchivo 'desvio.csv' generado correctamente.")
+
+    df_rsi = pd.DataFrame(resultados_rsi, columns=["Simbolo", "RSI"])
+    df_rsi.to_csv("rsi.csv", index=False, sep=";")
+    print("Archivo 'rsi.csv' generado correctamente.")
+
+    # === INFORME DE UTILIZACION ===
+    print(f"\nDuración total: {duracion:.1f} s")
+    for estadistica in (estadistica_descarga, estadistica_calculo, estadistica_graficos):
+        print(estadistica.informe(duracion))